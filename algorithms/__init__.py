@@ -7,47 +7,61 @@ Single source of truth for every algorithm the visualizer knows about.
 
 REGISTRY is a dict:
     {
-        "bfs": AlgoInfo(name, label, fn, pseudocode, tags, supports_negative, …),
+        "bfs": AlgoInfo(key, label, module, tags, supports_negative, …),
         …
     }
 
-AlgoInfo is a lightweight dataclass.  The engine and UI both consume it
-so adding a new algorithm is literally: write the generator, add one
-entry here.  That's the plugin system.
-"""
-
-from dataclasses import dataclass, field
-from typing import Callable, List, Dict, Optional
+Algorithm modules are NOT imported here.  Each AlgoInfo only names its
+module; `info.fn` / `info.pseudocode` import it on first access (after
+that it is a sys.modules hit), so startup only pays for the algorithms
+actually used.
 
-# ---------------------------------------------------------------------------
-# Import all algorithm modules
-# ---------------------------------------------------------------------------
-from algorithms.bfs              import bfs              as _bfs,              PSEUDOCODE as _bfs_pc
-from algorithms.dfs              import dfs              as _dfs,              PSEUDOCODE as _dfs_pc
-from algorithms.dijkstra         import dijkstra         as _dijkstra,         PSEUDOCODE as _dij_pc
-from algorithms.astar            import astar            as _astar,            PSEUDOCODE as _ast_pc
-from algorithms.bidirectional_bfs import bidirectional_bfs as _bibfs,          PSEUDOCODE as _bibfs_pc
-from algorithms.bellman_ford     import bellman_ford     as _bf,               PSEUDOCODE as _bf_pc
-from algorithms.floyd_warshall   import floyd_warshall   as _fw,               PSEUDOCODE as _fw_pc
-from algorithms.greedy_bfs       import greedy_bfs       as _gbfs,             PSEUDOCODE as _gbfs_pc
+AlgoInfo is a lightweight frozen dataclass (read-only, hashable).  The
+engine and UI both consume it so adding a new algorithm is literally:
+write the generator, add one entry here (or call register() from outside
+this file).  That's the plugin system.
+"""
 
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, List, Dict, Optional, Tuple
 
 # ---------------------------------------------------------------------------
 # AlgoInfo — metadata card for each algorithm
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AlgoInfo:
     key:               str                    # registry key, e.g. "bfs"
     label:             str                    # human label, e.g. "Breadth-First Search"
-    fn:                Callable               # the generator function
-    pseudocode:        List[str]              # lines for the side-panel
-    tags:              List[str] = field(default_factory=list)   # e.g. ["unweighted", "shortest-path"]
+    module:            str                    # where the generator lives, e.g. "algorithms.bfs"
+    tags:              Tuple[str, ...] = ()   # e.g. ("unweighted", "shortest-path")
     supports_negative: bool     = False       # can handle negative edges?
     is_all_pairs:      bool     = False       # Floyd-Warshall style?
     has_heuristic:     bool     = False       # A* / Greedy — expose heuristic selector?
     complexity_time:   str      = ""          # e.g. "O(V + E)"
     complexity_space:  str      = ""          # e.g. "O(V)"
     description:       str      = ""          # one-liner for the UI card
+    fn_name:           str      = ""          # generator name in `module` (default: key)
+    pc_name:           str      = "PSEUDOCODE"
+
+    def __post_init__(self):
+        # accept a list from callers, store a tuple so the record stays immutable
+        object.__setattr__(self, "tags", tuple(self.tags))
+
+    # -- lazily resolved from `module` --
+    @property
+    def fn(self) -> Callable:
+        """The generator function (imports `module` on first use)."""
+        return getattr(self._load(), self.fn_name or self.key)
+
+    @property
+    def pseudocode(self) -> Tuple[str, ...]:
+        """Lines for the side-panel (imports `module` on first use)."""
+        return tuple(getattr(self._load(), self.pc_name))
+
+    def _load(self) -> ModuleType:
+        return importlib.import_module(self.module)
 
 
 # ---------------------------------------------------------------------------
@@ -56,60 +70,60 @@ class AlgoInfo:
 REGISTRY: Dict[str, AlgoInfo] = {
 
     "bfs": AlgoInfo(
-        key="bfs", label="Breadth-First Search", fn=_bfs, pseudocode=_bfs_pc,
-        tags=["unweighted", "shortest-path", "traversal"],
+        key="bfs", label="Breadth-First Search", module="algorithms.bfs",
+        tags=("unweighted", "shortest-path", "traversal"),
         complexity_time="O(V + E)", complexity_space="O(V)",
         description="Explores layer-by-layer. Finds shortest path by hop count.",
     ),
 
     "dfs": AlgoInfo(
-        key="dfs", label="Depth-First Search", fn=_dfs, pseudocode=_dfs_pc,
-        tags=["unweighted", "traversal"],
+        key="dfs", label="Depth-First Search", module="algorithms.dfs",
+        tags=("unweighted", "traversal"),
         complexity_time="O(V + E)", complexity_space="O(V)",
         description="Dives deep before backtracking. Does NOT guarantee shortest path.",
     ),
 
     "dijkstra": AlgoInfo(
-        key="dijkstra", label="Dijkstra's Algorithm", fn=_dijkstra, pseudocode=_dij_pc,
-        tags=["weighted", "shortest-path"],
+        key="dijkstra", label="Dijkstra's Algorithm", module="algorithms.dijkstra",
+        tags=("weighted", "shortest-path"),
         complexity_time="O((V + E) log V)", complexity_space="O(V)",
         description="Greedily expands the closest node. Optimal for non-negative weights.",
     ),
 
     "astar": AlgoInfo(
-        key="astar", label="A* Search", fn=_astar, pseudocode=_ast_pc,
-        tags=["weighted", "shortest-path", "heuristic"],
+        key="astar", label="A* Search", module="algorithms.astar",
+        tags=("weighted", "shortest-path", "heuristic"),
         has_heuristic=True,
         complexity_time="O((V + E) log V)", complexity_space="O(V)",
         description="Dijkstra + heuristic guidance. Optimal when h is admissible.",
     ),
 
     "bidirectional_bfs": AlgoInfo(
-        key="bidirectional_bfs", label="Bidirectional BFS", fn=_bibfs, pseudocode=_bibfs_pc,
-        tags=["unweighted", "shortest-path", "bidirectional"],
+        key="bidirectional_bfs", label="Bidirectional BFS", module="algorithms.bidirectional_bfs",
+        tags=("unweighted", "shortest-path", "bidirectional"),
         complexity_time="O(b^(d/2))", complexity_space="O(b^(d/2))",
         description="Two frontiers from source & target. Meets in the middle — explores far fewer nodes.",
     ),
 
     "bellman_ford": AlgoInfo(
-        key="bellman_ford", label="Bellman–Ford", fn=_bf, pseudocode=_bf_pc,
-        tags=["weighted", "shortest-path", "negative-edges"],
+        key="bellman_ford", label="Bellman–Ford", module="algorithms.bellman_ford",
+        tags=("weighted", "shortest-path", "negative-edges"),
         supports_negative=True,
         complexity_time="O(V · E)", complexity_space="O(V)",
         description="Handles negative edges. Detects negative cycles. Slower than Dijkstra.",
     ),
 
     "floyd_warshall": AlgoInfo(
-        key="floyd_warshall", label="Floyd–Warshall", fn=_fw, pseudocode=_fw_pc,
-        tags=["weighted", "all-pairs", "negative-edges"],
+        key="floyd_warshall", label="Floyd–Warshall", module="algorithms.floyd_warshall",
+        tags=("weighted", "all-pairs", "negative-edges"),
         supports_negative=True, is_all_pairs=True,
         complexity_time="O(V³)", complexity_space="O(V²)",
         description="All-pairs shortest paths via dynamic programming. Watch the matrix evolve!",
     ),
 
     "greedy_bfs": AlgoInfo(
-        key="greedy_bfs", label="Greedy Best-First", fn=_gbfs, pseudocode=_gbfs_pc,
-        tags=["heuristic", "suboptimal"],
+        key="greedy_bfs", label="Greedy Best-First", module="algorithms.greedy_bfs",
+        tags=("heuristic", "suboptimal"),
         has_heuristic=True,
         complexity_time="O((V + E) log V)", complexity_space="O(V)",
         description="Pure heuristic — fast but NOT optimal. Compare with A* to see the difference!",
@@ -130,9 +144,31 @@ def list_algorithms() -> List[AlgoInfo]:
     return list(REGISTRY.values())
 
 
-def algorithms_by_tag(tag: str) -> List[AlgoInfo]:
-    """Filter registry by tag."""
-    return [a for a in REGISTRY.values() if tag in a.tags]
+def algorithms_by_tag(tag: str) -> Tuple[AlgoInfo, ...]:
+    """All algorithms carrying `tag`, in registry order (O(1) index lookup)."""
+    return _BY_TAG.get(tag, ())
+
+
+def register(info: AlgoInfo) -> None:
+    """Add (or replace) an algorithm and keep the tag index in sync."""
+    REGISTRY[info.key] = info
+    _rebuild_tag_index()
+
+
+# ---------------------------------------------------------------------------
+# Tag index — {tag: (AlgoInfo, …)}, rebuilt whenever register() runs
+# ---------------------------------------------------------------------------
+_BY_TAG: Dict[str, Tuple[AlgoInfo, ...]] = {}
+
+def _rebuild_tag_index() -> None:
+    index: Dict[str, List[AlgoInfo]] = {}
+    for info in REGISTRY.values():
+        for tag in info.tags:
+            index.setdefault(tag, []).append(info)
+    _BY_TAG.clear()
+    _BY_TAG.update((tag, tuple(infos)) for tag, infos in index.items())
+
+_rebuild_tag_index()
 
 
 __all__ = [
@@ -141,4 +177,5 @@ __all__ = [
     "get_algorithm",
     "list_algorithms",
     "algorithms_by_tag",
+    "register",
 ]
@@ -0,0 +1,239 @@
+"""
+_kernels.py — Search Kernels
+=============================
+The bare searches behind `bfs()` and `dfs()` (and Floyd-Warshall's
+condensed levels), split from Step emission.
+
+A kernel runs the whole search over the CSR lists (`Graph.as_csr()`)
+with ints only — no Step, StepBuilder or string id in the loop — and
+records what happened as a flat event trace:
+
+    events = array("i", [op, u, k,  op, u, k,  …])
+
+    op : one of the opcodes below
+    u  : idx of the node being expanded
+    k  : arc slot (nbrs[k] is the neighbour, edge_ids[k] the edge), or -1
+
+Each kernel also returns `parent` (idx of the node that reached each
+node, -1 for none) and `via` (the arc slot it was reached by, so the
+path's edges are edge_ids[via[…]] with no edge lookup by endpoints);
+`reconstruct_path` turns the two into a path for any search that keeps
+them.
+
+The generators then replay the trace and build Steps lazily, one per
+event, exactly as they used to while searching.  Keeping the search in
+one tight function is also what makes it easy to hand to a JIT later:
+every argument is already a flat int sequence.
+"""
+
+from array import array
+from heapq import heappop, heappush
+from typing import List, Optional, Sequence, Tuple
+
+# ---------------------------------------------------------------------------
+# Event opcodes
+# ---------------------------------------------------------------------------
+DEQUEUE   = 0     # BFS: u taken from the queue
+EDGE_NEW  = 1     # arc k out of u reaches an unvisited node
+EDGE_SEEN = 2     # arc k out of u reaches a visited node
+ENQUEUE   = 3     # BFS: nbrs[k] appended to the queue (parent = u)
+FOUND     = 4     # u is the target — search stops
+POP_SEEN  = 5     # DFS: u popped but already visited
+POP_VISIT = 6     # DFS: u popped and marked visited
+PUSH      = 7     # DFS: nbrs[k] pushed on the stack
+
+# Per-node state byte: bit 0 = seen / visited, bit 1 = blocked.  One load
+# and one test (`if m:`) clear the common case — an open, unseen neighbour.
+SEEN    = 1
+BLOCKED = 2
+_AS_BLOCKED = bytes.maketrans(b"\x00\x01", b"\x00\x02")   # blocked mask → state
+
+
+def _state_mask(blocked: Sequence[int]) -> bytearray:
+    """Fresh per-node state bytes with the BLOCKED bit set from `blocked`."""
+    return bytearray(blocked).translate(_AS_BLOCKED)
+
+
+def bfs_kernel(
+    indptr: Sequence[int], nbrs: Sequence[int], blocked: Sequence[int],
+    s: int, t: int,
+) -> Tuple[array, array, array]:
+    """BFS from s (stops at t, or exhausts).  Returns (parent, via, events)."""
+    V      = len(indptr) - 1
+    parent = array("i", [-1]) * V
+    via    = array("i", [-1]) * V
+    state  = _state_mask(blocked)
+    state[s] |= SEEN
+    events = array("i")
+    emit   = events.extend
+    # every node is enqueued at most once, so the queue is a plain list
+    # read through a head index: no deque block allocation, no popleft call
+    queue  = [s]
+    push   = queue.append
+    head   = 0
+    while head < len(queue):
+        u = queue[head]
+        head += 1
+        emit((DEQUEUE, u, -1))
+        if u == t:
+            emit((FOUND, u, -1))
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            j = nbrs[k]
+            m = state[j]
+            if m:
+                if m == SEEN:
+                    emit((EDGE_SEEN, u, k))
+                continue
+            emit((EDGE_NEW, u, k))
+            state[j]  = SEEN
+            parent[j] = u
+            via[j]    = k
+            push(j)
+            emit((ENQUEUE, u, k))
+    return parent, via, events
+
+
+def dfs_kernel(
+    indptr: Sequence[int], nbrs: Sequence[int], blocked: Sequence[int],
+    s: int, t: int, on_push: bool = False,
+) -> Tuple[array, array, array]:
+    """
+    Iterative DFS from s (stops at t, or exhausts).  Returns (parent, via,
+    events).
+
+    Mark-on-pop by default: a node may sit on the stack several times and
+    its parent is whoever pushed it first.  With on_push=True a node is
+    marked SEEN when pushed, so it is pushed and popped at most once and
+    POP_SEEN never occurs: fewer events and a shorter stack on dense
+    graphs, at the price of a less strictly depth-first visiting order.
+    """
+    V       = len(indptr) - 1
+    parent  = array("i", [-1]) * V
+    via     = array("i", [-1]) * V
+    state   = _state_mask(blocked)
+    events  = array("i")
+    emit    = events.extend
+    stack   = [s]
+    if on_push:
+        state[s] |= SEEN
+    while stack:
+        u = stack.pop()
+        if not on_push:
+            if state[u] & SEEN:
+                emit((POP_SEEN, u, -1))
+                continue
+            state[u] |= SEEN
+        emit((POP_VISIT, u, -1))
+        if u == t:
+            emit((FOUND, u, -1))
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            j = nbrs[k]
+            m = state[j]
+            if m:
+                if m == SEEN:
+                    emit((EDGE_SEEN, u, k))
+                continue
+            emit((EDGE_NEW, u, k))
+            if on_push:
+                state[j]  = SEEN
+                parent[j] = u
+                via[j]    = k
+            elif parent[j] == -1 and j != s:
+                parent[j] = u
+                via[j]    = k
+            stack.append(j)
+            emit((PUSH, u, k))
+    return parent, via, events
+
+
+# ---------------------------------------------------------------------------
+# Path reconstruction
+# ---------------------------------------------------------------------------
+def reconstruct_path(
+    ids: Sequence[str], edge_ids: Sequence[str],
+    parent: Sequence[int], via: Sequence[int], target: int,
+) -> Tuple[List[str], List[str]]:
+    """
+    (path node ids, path edge ids) from the search root to `target`,
+    following `parent` and taking each hop's edge from its `via` arc slot.
+    """
+    path, edges, cur = [], [], target
+    while cur != -1:
+        path.append(ids[cur])
+        if via[cur] != -1:
+            edges.append(edge_ids[via[cur]])
+        cur = parent[cur]
+    path.reverse()
+    edges.reverse()
+    return path, edges
+
+
+# ---------------------------------------------------------------------------
+# Floyd-Warshall
+# ---------------------------------------------------------------------------
+def fw_round_kernel(
+    dist: List[List[float]], nxt: List[List[Optional[int]]], k: int,
+) -> int:
+    """
+    One Floyd-Warshall k-round over the n×n `dist` / next-hop `nxt` rows,
+    with no Step or snapshot.  Only the columns where row k is finite can
+    improve, so they are gathered once per round and every row scans just
+    those (sparse graphs leave most of row k at ∞ for many rounds).  Row k
+    and column k cannot change during round k, so this matches the
+    cell-by-cell loop exactly.  Mutates dist / nxt in place and returns
+    the number of updates.
+    """
+    INF     = float("inf")
+    dk      = dist[k]
+    cols    = [j for j, x in enumerate(dk) if x != INF]
+    via_k   = [dk[j] for j in cols]
+    updates = 0
+    for i, di in enumerate(dist):
+        dik = di[k]
+        if dik == INF or i == k:
+            continue
+        ni, hop = nxt[i], nxt[i][k]
+        for j, dkj in zip(cols, via_k):
+            c = dik + dkj
+            if c < di[j] and j != i:       # the diagonal stays 0, as in the full loop
+                di[j] = c
+                ni[j] = hop
+                updates += 1
+    return updates
+
+
+def apsp_dijkstra_kernel(
+    dist: List[List[float]], nxt: List[List[Optional[int]]],
+    adj: List[List[Tuple[int, float]]],
+) -> None:
+    """
+    All pairs at once as one binary-heap Dijkstra per source row — the
+    alternative to n calls of fw_round_kernel when no result but the last
+    is shown.  O(V·E log V) instead of O(V³), so it wins on sparse graphs;
+    only valid when no weight is negative.  `adj[u]` lists (v, w) for every
+    traversable arc, in matrix indices.  Rewrites each row of dist / nxt in
+    place with the distances the rounds would reach; where two routes tie,
+    the next hop may name the other one.
+    """
+    INF = float("inf")
+    n   = len(dist)
+    for s in range(n):
+        row = [INF] * n
+        hop: List[Optional[int]] = [None] * n
+        row[s], hop[s] = 0, s
+        heap = [(0, s)]
+        while heap:
+            d, u = heappop(heap)
+            if d > row[u]:
+                continue                   # stale entry
+            first = hop[u]
+            for v, wk in adj[u]:
+                c = d + wk
+                if c < row[v]:
+                    row[v] = c
+                    hop[v] = v if u == s else first
+                    heappush(heap, (c, v))
+        dist[s][:] = row
+        nxt[s][:]  = hop
@@ -12,29 +12,44 @@ Ships three built-in heuristics:
 The overlay exposes g, h, f for every node that has been touched,
 which the Heuristic Playground panel uses to teach admissibility.
 
+Steps are delta-encoded (see algorithms.step.StepDeltas): the closed
+set, the open-set frontier and their sticky colours go out as changes
+plus a periodic keyframe; use `algorithms.step.materialize` for a flat
+view.
+
 Yields same event types as Dijkstra, plus heuristic-specific explanations.
+
+The open set (heap4.Heap4) holds node idx, not id strings, and Heap4
+leaves the order among equal keys unspecified: nodes with equal f (e.g.
+under a zero heuristic) may be expanded in a different order than in
+older versions, which broke such ties by node id.
 """
 
-import heapq, math
-from typing import Generator, Optional, List, Dict, Callable
+import math
+from array import array
+from typing import Generator, List, Dict, Callable, Sequence
 
 from graph import Graph, Node
-from algorithms.step import Step, StepBuilder
+from algorithms.step import Step, StepBuilder, StepDeltas
+from algorithms.heap4 import Heap4
+from algorithms._kernels import reconstruct_path
 
 
 # ---------------------------------------------------------------------------
 # Built-in heuristics  (all take two Node objects, return float)
 # ---------------------------------------------------------------------------
+_OCTILE_K = math.sqrt(2) - 1      # extra cost of a diagonal step over a straight one
+
 def manhattan(a: Node, b: Node) -> float:
     return abs(a.x - b.x) + abs(a.y - b.y)
 
 def euclidean(a: Node, b: Node) -> float:
-    return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+    return math.hypot(a.x - b.x, a.y - b.y)
 
 def octile(a: Node, b: Node) -> float:
     dx = abs(a.x - b.x)
     dy = abs(a.y - b.y)
-    return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+    return max(dx, dy) + _OCTILE_K * min(dx, dy)
 
 def zero(a: Node, b: Node) -> float:
     """h=0 → A* degrades to Dijkstra.  Useful for teaching."""
@@ -48,6 +63,63 @@ HEURISTICS: Dict[str, Callable[[Node, Node], float]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Bulk heuristic tables  (one specialised builder per built-in heuristic)
+#
+# Each builder takes flat coordinate lists plus the target position and
+# returns h for every node, with the heuristic's arithmetic inlined into a
+# single comprehension — no per-node function call or Node attribute hop.
+# ---------------------------------------------------------------------------
+def _manhattan_table(xs: List[float], ys: List[float], tx: float, ty: float) -> List[float]:
+    return [abs(x - tx) + abs(y - ty) for x, y in zip(xs, ys)]
+
+def _euclidean_table(xs: List[float], ys: List[float], tx: float, ty: float) -> List[float]:
+    hypot = math.hypot
+    return [hypot(x - tx, y - ty) for x, y in zip(xs, ys)]
+
+def _octile_table(xs: List[float], ys: List[float], tx: float, ty: float) -> List[float]:
+    k = _OCTILE_K
+    vals = []
+    for x, y in zip(xs, ys):
+        dx, dy = abs(x - tx), abs(y - ty)
+        vals.append(max(dx, dy) + k * min(dx, dy))
+    return vals
+
+def _zero_table(xs: List[float], ys: List[float], tx: float, ty: float) -> List[float]:
+    return [0.0] * len(xs)
+
+HEURISTIC_TABLES: Dict[str, Callable[[List[float], List[float], float, float], List[float]]] = {
+    "manhattan": _manhattan_table,
+    "euclidean": _euclidean_table,
+    "octile":    _octile_table,
+    "zero":      _zero_table,
+}
+
+
+def heuristic_table(graph: Graph, target: str, heuristic: str = "euclidean") -> List[float]:
+    """
+    h(v, target) for EVERY node, indexed by `graph.node_index`.  The target
+    is fixed for the whole run, so the table is built once up front and
+    lookups become a single list index.  Dispatch happens once per run:
+    built-ins use their specialised bulk builder, a custom entry added to
+    HEURISTICS is called once per node, anything else falls back to
+    euclidean.  All zeros if the target is not in the graph.
+    """
+    nodes = graph.nodes.values()           # same order as graph.node_index
+    target_node = graph.get_node(target)
+    if target_node is None:
+        return [0.0] * len(nodes)
+
+    build = HEURISTIC_TABLES.get(heuristic)
+    if build is None and heuristic in HEURISTICS:
+        h_fn = HEURISTICS[heuristic]
+        return [h_fn(n, target_node) for n in nodes]
+
+    xs = [n.x for n in nodes]
+    ys = [n.y for n in nodes]
+    return (build or _euclidean_table)(xs, ys, target_node.x, target_node.y)
+
+
 # ---------------------------------------------------------------------------
 # Pseudocode
 # ---------------------------------------------------------------------------
@@ -80,6 +152,7 @@ def astar(
     source: str,
     target: str,
     heuristic: str = "euclidean",
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
     """
     Args:
@@ -87,155 +160,258 @@ def astar(
         source    : Start node id.
         target    : Goal node id.
         heuristic : Key into HEURISTICS dict, or "euclidean" default.
+        detail    : "full"  – pop + one Step per edge (default).
+                    "round" – one Step per expansion; its relaxations are
+                              listed in `batched_relaxations`.
+                    "final" – init + final Step only; the final Step carries
+                              every relaxation of the run.
     """
 
-    h_fn = HEURISTICS.get(heuristic, euclidean)
-    target_node = graph.get_node(target)
+    h_tab = heuristic_table(graph, target, heuristic)   # h per node idx
+    csr   = graph.as_csr()                               # flat adjacency for the relax loop
+    ids, index, indptr, nbrs, weights, edge_ids, blocked = csr
 
     INF     = float("inf")
     step_no = 0
-
-    g_score: Dict[str, float]          = {nid: INF for nid in graph.nodes}
-    f_score: Dict[str, float]          = {nid: INF for nid in graph.nodes}
-    parent: Dict[str, Optional[str]]   = {}
-    closed: set                        = set()
-
-    src_node = graph.get_node(source)
-    g_score[source] = 0.0
-    h_val          = h_fn(src_node, target_node) if src_node and target_node else 0.0
-    f_score[source] = h_val
-    open_set       = [(f_score[source], source)]
+    V       = len(ids)
+    order   = sorted(range(V), key=ids.__getitem__)   # overlay rows sorted by id
+
+    g_score = array("d", [INF]) * V
+    f_score = array("d", [INF]) * V
+    parent  = array("i", [-1]) * V
+    via     = array("i", [-1]) * V      # arc slot each node was reached by
+    closed  = bytearray(V)
+    touched = bytearray(V)              # nodes whose h is shown in the overlay
+
+    s = index.get(source)
+    t = index.get(target, -1)
+    open_set = Heap4()                  # indexed: one slot per node, decrease-key in place
+    h_val    = 0.0
+    if s is not None:
+        h_val      = h_tab[s]
+        g_score[s] = 0.0
+        f_score[s] = h_val
+        touched[s] = 1
+        open_set.push(s, h_val)
+
+    # frontier = nodes in open_set, each once, in order of first push
+    frontier: Dict[int, None] = {} if s is None else {s: None}
+
+    # closed set / frontier (and its sticky colour) go out as per-step deltas
+    d = StepDeltas()
+    d.track("frontier", lambda: [ids[i] for i in frontier])
+    if s is not None:
+        d.paint(source, "frontier")
 
     # --- init step ---
     sb = StepBuilder()
     sb.set_current(source)
-    sb.distances        = {"g": dict(g_score), "h": {source: h_val}, "f": dict(f_score)}
+    g0, f0 = dict.fromkeys(ids, INF), dict.fromkeys(ids, INF)   # pre-sized, filled in C
+    if s is not None:
+        g0[source], f0[source] = 0.0, h_val
+    sb.distances        = {"g": g0, "h": {source: h_val}, "f": f0}
     sb.pseudocode_line  = 2
     sb.explanation      = (
         f"A* init: g(source)=0, h(source)={h_val:.2f} (using {heuristic}), "
         f"f(source)={h_val:.2f}. Push into open set."
     )
-    sb.overlay["queue"]     = [(f, n) for f, n in open_set]
+    # overlay snapshots are O(V) to build; Steps are immutable, so one
+    # snapshot is shared by every Step until open_set / g / f / h changes.
+    # None = stale, rebuilt on next use.
+    queue_snap  = _queue_snapshot(ids, open_set)
+    scores_snap = _scores_snapshot(ids, order, g_score, f_score, h_tab, touched)
+
+    sb.overlay["queue"]     = queue_snap
     sb.overlay["heuristic"] = heuristic
-    sb.overlay["scores"]    = _scores_snapshot(g_score, f_score, {source: h_val})
+    sb.overlay["scores"]    = scores_snap
+    d.stamp(sb, step_no)
     yield sb.build(step_number=step_no)
     step_no += 1
 
-    h_cache: Dict[str, float] = {source: h_val}   # cache h values
+    bound = INF             # best g(target) found so far — upper bound on the answer
+    batch: List = []        # relaxations not yet shown: (edge_id, u, v, new_g)
 
     # --- main loop ---
     while open_set:
-        _, node = heapq.heappop(open_set)
-
-        if node in closed:
-            continue
-
-        closed.add(node)
-
-        # -- pop event --
-        sb2 = StepBuilder()
-        sb2.visited_set     = list(closed)
-        sb2.set_current(node)
-        sb2.visit(node)
-        sb2.set_frontier([n for _, n in open_set if n not in closed])
-        sb2.pseudocode_line = 6
-        sb2.explanation     = (
-            f"Pop '{node}': g={g_score[node]:.2f}, h={h_cache.get(node,0):.2f}, "
-            f"f={f_score[node]:.2f}. Expand neighbours."
-        )
-        sb2.overlay["queue"]  = [(f, n) for f, n in open_set if n not in closed]
-        sb2.overlay["scores"] = _scores_snapshot(g_score, f_score, h_cache)
-        yield sb2.build(step_number=step_no)
-        step_no += 1
+        _, u = open_set.pop_min()         # never stale: no duplicates in an indexed heap
+        closed[u] = 1
+        node = ids[u]
+        del frontier[u]
+        d.add_visited(node)
+        d.discard(node, "frontier")
+        d.paint(node, None)
+        queue_snap = None
+
+        # -- pop event --  (folded into the expansion step at coarser detail)
+        if detail == "full":
+            sb.reset()
+            sb.set_current(node)
+            sb.visit(node)
+            sb.metrics["nodes_visited"] = len(d.visited)
+            queue_snap = _queue_snapshot(ids, open_set)
+            sb.pseudocode_line = 6
+            sb.explanation     = (
+                f"Pop '{node}': g={g_score[u]:.2f}, h={h_tab[u] if touched[u] else 0:.2f}, "
+                f"f={f_score[u]:.2f}. Expand neighbours."
+            )
+            sb.overlay["queue"]  = queue_snap
+            sb.overlay["scores"] = scores_snap
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
+            step_no += 1
 
         # -- target check --
-        if node == target:
-            path = _reconstruct(parent, target)
-            sb3 = StepBuilder()
-            sb3.visited_set     = list(closed)
-            sb3.pseudocode_line = 7
-            sb3.set_path(path)
-            total_cost = g_score[target]
-            sb3.explanation     = (
+        if u == t:
+            path, path_edges = reconstruct_path(ids, edge_ids, parent, via, u)
+            sb.reset()
+            sb.pseudocode_line = 7
+            sb.set_path(path)
+            total_cost = g_score[u]
+            sb.explanation     = (
                 f"🎯 Target '{target}' reached! Optimal cost = {total_cost:.2f}. "
                 f"Path: {' → '.join(path)}"
             )
-            for i in range(len(path) - 1):
-                e = graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    sb3.choose_edge(e.id)
-            sb3.overlay["scores"] = _scores_snapshot(g_score, f_score, h_cache)
-            yield sb3.build(step_number=step_no, is_final=True)
+            for eid in path_edges:
+                sb.choose_edge(eid)
+            if scores_snap is None:
+                scores_snap = _scores_snapshot(ids, order, g_score, f_score, h_tab, touched)
+            sb.overlay["scores"] = scores_snap
+            for eid, a, b, g in batch:
+                sb.add_batched_relaxation(eid, a, b, g)
+            d.stamp(sb, step_no, full=True)
+            yield sb.build(step_number=step_no, is_final=True)
             return
 
         # -- relax neighbours --
-        node_obj = graph.get_node(node)
-        for nbr, edge in graph.neighbours(node):
-            nbr_node = graph.get_node(nbr)
-            if nbr_node and nbr_node.blocked:
+        expanded: List = []                # (nbr, edge_id, improved) for detail="round"
+        for k in range(indptr[u], indptr[u + 1]):
+            j = nbrs[k]
+            if blocked[j] or closed[j]:
                 continue
-            if nbr in closed:
+
+            nbr         = ids[j]
+            eid         = edge_ids[k]
+            tentative_g = g_score[u] + weights[k]
+            # h ≥ 0, so any route through nbr costs ≥ tentative_g: once that
+            # already matches the best known cost to target, nbr is useless
+            pruned      = tentative_g >= bound
+            improved    = tentative_g < g_score[j] and not pruned
+
+            # reveal h in the overlay (looked up from the precomputed table)
+            if not pruned and not touched[j]:
+                touched[j]  = 1
+                scores_snap = None
+
+            if improved:
+                if j == t:
+                    bound = tentative_g
+                g_score[j] = tentative_g
+                f_score[j] = tentative_g + h_tab[j]
+                parent[j]  = u
+                via[j]     = k
+                if j in open_set:
+                    open_set.decrease_key(j, f_score[j])
+                else:
+                    open_set.push(j, f_score[j])
+                    frontier[j] = None
+                    d.push(nbr, "frontier")
+                    d.paint(nbr, "frontier")
+                queue_snap = scores_snap = None
+                if detail != "full":
+                    batch.append((eid, node, nbr, tentative_g))
+
+            if detail != "full":
+                expanded.append((nbr, eid, improved))
                 continue
 
-            tentative_g = g_score[node] + edge.weight
-
-            # compute / cache h
-            if nbr not in h_cache and nbr_node and target_node:
-                h_cache[nbr] = h_fn(nbr_node, target_node)
-
-            sb_r = StepBuilder()
-            sb_r.visited_set     = list(closed)
-            sb_r.set_current(node)
-            sb_r.set_frontier([n for _, n in open_set if n not in closed])
-            sb_r.relax_edge(edge.id)
-            sb_r.pseudocode_line = 10
-
-            if tentative_g < g_score[nbr]:
-                g_score[nbr] = tentative_g
-                f_score[nbr] = tentative_g + h_cache.get(nbr, 0.0)
-                parent[nbr]  = node
-                heapq.heappush(open_set, (f_score[nbr], nbr))
-                sb_r.node_states[nbr] = "frontier"
-                sb_r.explanation = (
+            sb.reset()
+            sb.set_current(node)
+            sb.relax_edge(eid)
+            sb.pseudocode_line = 10
+
+            if improved:
+                sb.node_states[nbr] = "frontier"
+                sb.explanation = (
                     f"Relax {node}→{nbr}: g={tentative_g:.2f}, "
-                    f"h={h_cache.get(nbr,0):.2f}, f={f_score[nbr]:.2f} — UPDATE!"
+                    f"h={h_tab[j]:.2f}, f={f_score[j]:.2f} — UPDATE!"
+                )
+            elif tentative_g < g_score[j]:
+                sb.edge_states[eid] = "ignored"
+                sb.explanation = (
+                    f"Edge {node}→{nbr}: g={tentative_g:.2f} ≥ best cost to "
+                    f"'{target}' so far ({bound:.2f}) — pruned, no h needed."
                 )
             else:
-                sb_r.edge_states[edge.id] = "ignored"
-                sb_r.explanation = (
+                sb.edge_states[eid] = "ignored"
+                sb.explanation = (
                     f"Edge {node}→{nbr}: tentative g={tentative_g:.2f} ≥ "
-                    f"current g={g_score[nbr]:.2f} — no improvement."
+                    f"current g={g_score[j]:.2f} — no improvement."
                 )
 
-            sb_r.overlay["queue"]  = [(f, n) for f, n in open_set if n not in closed]
-            sb_r.overlay["scores"] = _scores_snapshot(g_score, f_score, h_cache)
-            yield sb_r.build(step_number=step_no)
+            if queue_snap is None:
+                queue_snap = _queue_snapshot(ids, open_set)
+            if scores_snap is None:
+                scores_snap = _scores_snapshot(ids, order, g_score, f_score, h_tab, touched)
+            sb.overlay["queue"]  = queue_snap
+            sb.overlay["scores"] = scores_snap
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
+            step_no += 1
+
+        # -- one condensed step per expansion --
+        if detail == "round":
+            sb.reset()
+            sb.set_current(node)
+            sb.visit(node)
+            sb.metrics["nodes_visited"] = len(d.visited)
+            if queue_snap is None:
+                queue_snap = _queue_snapshot(ids, open_set)
+            if scores_snap is None:
+                scores_snap = _scores_snapshot(ids, order, g_score, f_score, h_tab, touched)
+            sb.pseudocode_line = 9
+            for nbr, eid, improved in expanded:
+                sb.edge_states[eid] = "relaxed" if improved else "ignored"
+                if improved:
+                    sb.node_states[nbr] = "frontier"
+            for eid, a, b, g in batch:
+                sb.add_batched_relaxation(eid, a, b, g)
+            batch = []
+            sb.explanation = (
+                f"Expand '{node}' (g={g_score[u]:.2f}): {len(expanded)} neighbour(s) "
+                f"examined, {sum(1 for e in expanded if e[2])} improved."
+            )
+            sb.overlay["queue"]  = queue_snap
+            sb.overlay["scores"] = scores_snap
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
 
     # --- not found ---
-    sb_fin = StepBuilder()
-    sb_fin.visited_set     = list(closed)
-    sb_fin.pseudocode_line = 16
-    sb_fin.explanation     = f"Open set empty. '{target}' not reachable."
-    sb_fin.overlay["scores"] = _scores_snapshot(g_score, f_score, h_cache)
-    yield sb_fin.build(step_number=step_no, is_final=True)
+    sb.reset()
+    sb.pseudocode_line = 16
+    sb.explanation     = f"Open set empty. '{target}' not reachable."
+    if scores_snap is None:
+        scores_snap = _scores_snapshot(ids, order, g_score, f_score, h_tab, touched)
+    sb.overlay["scores"] = scores_snap
+    for eid, a, b, g in batch:
+        sb.add_batched_relaxation(eid, a, b, g)
+    d.stamp(sb, step_no, full=True)
+    yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-def _scores_snapshot(g: Dict, f: Dict, h: Dict) -> List[Dict]:
-    """Return a list of {node, g, h, f} dicts for the overlay panel."""
-    nodes = set(g.keys()) | set(f.keys()) | set(h.keys())
+def _scores_snapshot(
+    ids: List[str], order: List[int],
+    g: Sequence[float], f: Sequence[float], h: Sequence[float], touched: bytearray,
+) -> List[Dict]:
+    """Return a list of {node, g, h, f} dicts (one per node, sorted by id) for the overlay panel."""
     return [
-        {"node": n, "g": g.get(n, float("inf")), "h": h.get(n, 0), "f": f.get(n, float("inf"))}
-        for n in sorted(nodes)
+        {"node": ids[i], "g": g[i], "h": h[i] if touched[i] else 0, "f": f[i]}
+        for i in order
     ]
 
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path, cur = [], target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+def _queue_snapshot(ids: List[str], open_set: Heap4) -> List:
+    """Open set as [(f, node_id)] for the queue overlay."""
+    return [(f, ids[i]) for f, i in open_set.items()]
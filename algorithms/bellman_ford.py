@@ -5,8 +5,12 @@ The only single-source shortest-path algorithm that handles NEGATIVE edge
 weights (but not negative cycles).
 
 Structure:
-  • V-1 rounds of relaxing every edge in the graph.
-  • A V-th "detector" round that flags negative cycles.
+  • Up to V-1 rounds of relaxation.  A round only scans the edges leaving
+    "dirty" nodes — those whose dist dropped in the previous round (round 1:
+    just the source).  Edges out of unchanged nodes cannot improve anything,
+    so this is the same answer with far less work; a round that dirties
+    nothing means the distances have converged.
+  • A V-th "detector" round (over ALL edges) that flags negative cycles.
 
 Yields a Step for:
   1. Each successful relaxation (dist improved)
@@ -19,12 +23,34 @@ Overlay:
   • "round"            – current round number (1-indexed)
   • "distances"        – full distance map
   • "negative_cycle"   – True/False after detector round
+
+Per-edge steps are delta-encoded: they carry only the (node, old, new)
+distance change (if any) plus the step_number of the last round-level
+keyframe; init / round / detector / final steps carry the full map.
+Use `algorithms.step.materialize` to get a flat view of an edge step.
+
+`detail` levels (see `algorithms.dijkstra`):
+  • "full"  – everything above (default).
+  • "round" – no per-edge steps (1, 2) or round-start banners: each round
+              runs through the silent, bulk `_relax_round` kernel and its
+              summary step lists the round's successful relaxations in
+              `batched_relaxations`.  O(V) steps instead of O(V·E).
+  • "final" – only the init step and the final verdict, whose
+              `batched_relaxations` holds every relaxation of the run.
+Same distances and final verdict at every level.  (The kernel relaxes
+from round-start distances, so it may need a round or two more than the
+edge-by-edge scan and can pick a different tie-breaking parent among
+equal-cost paths.)
 """
 
-from typing import Generator, Optional, List, Dict
+from array import array
+from itertools import chain, compress
+from operator import add, lt
+from typing import Generator, List, Dict, MutableSequence, Sequence, Set
 
 from graph import Graph
 from algorithms.step import Step, StepBuilder
+from algorithms._kernels import reconstruct_path
 
 
 # ---------------------------------------------------------------------------
@@ -55,34 +81,58 @@ def bellman_ford(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
+    """
+    Args:
+        graph  : The graph (may contain negative weights).
+        source : Start node id.
+        target : Node whose shortest path is reconstructed at the end.
+        detail : "full" (one Step per edge), "round" (one per round) or
+                 "final" (init + verdict only) — see module docstring.
+    """
 
     INF     = float("inf")
     step_no = 0
     V       = graph.node_count()
 
-    dist:   Dict[str, float]          = {nid: INF for nid in graph.nodes}
-    parent: Dict[str, Optional[str]]  = {}
-    dist[source] = 0.0
+    # flat arc arrays: arc k is src[k] → tgt[k] (weight w[k]), reverse arcs
+    # for undirected edges included; nodes are ints 0 … V-1
+    soa     = graph.as_soa()
+    ids     = soa.ids
+    src, tgt, w, edge_ids, blocked = soa.src, soa.tgt, soa.w, soa.edge_ids, soa.blocked
+    n_arcs  = len(src)
+
+    dist   = array("d", [INF]) * V          # flat doubles indexed by node idx
+    parent = array("i", [-1]) * V
+    via    = array("i", [-1]) * V           # arc index each node was last relaxed through
+    s_idx = soa.index.get(source)
+    if s_idx is not None:
+        dist[s_idx] = 0.0
 
-    # collect all edges as (src, tgt, weight, edge_obj) — include reverse for undirected
-    all_edges: List = []
-    for edge in graph.edges.values():
-        all_edges.append((edge.source, edge.target, edge.weight, edge))
-        if not edge.directed:
-            all_edges.append((edge.target, edge.source, edge.weight, edge))
+    # live-arc mask, computed ONCE: arcs touching a blocked node can never
+    # relax, so every round (and the detector) iterates only the rest
+    live_arcs = [k for k in range(n_arcs) if not (blocked[src[k]] or blocked[tgt[k]])]
+    # live arcs grouped by source node (original order within each group)
+    out_arcs: List[List[int]] = [[] for _ in range(V)]
+    for k in live_arcs:
+        out_arcs[src[k]].append(k)
+
+    dirty = {s_idx} if s_idx is not None else set()   # nodes whose dist changed last round
+    batch: List = []                     # (edge_id, u_idx, v_idx, new_dist) not yet shown
 
     # -- init step --
     sb = StepBuilder()
     sb.set_current(source)
-    sb.distances        = dict(dist)
+    sb.distances        = _dist_map(ids, dist)
     sb.pseudocode_line  = 2
     sb.explanation      = (
         f"Bellman-Ford init: dist['{source}'] = 0, all others = ∞. "
-        f"Will run {V-1} relaxation rounds over all {len(all_edges)} directed edges."
+        f"Will run {V-1} relaxation rounds over all {n_arcs} directed edges."
     )
     sb.overlay["round"]     = 0
-    sb.overlay["distances"] = dict(dist)
+    sb.overlay["distances"] = _dist_map(ids, dist)
+    keyframe = step_no                     # last step with a full distance map
     yield sb.build(step_number=step_no)
     step_no += 1
 
@@ -91,150 +141,197 @@ def bellman_ford(
     # ==============================================================
     for round_idx in range(1, V):                  # rounds 1 … V-1
 
-        any_relaxed = False
+        # arcs to scan this round: out-edges of dirty nodes, in node order
+        arcs = list(chain.from_iterable(map(out_arcs.__getitem__, sorted(dirty))))
 
-        # -- round-start step --
-        sb_rs = StepBuilder()
-        sb_rs.distances        = dict(dist)
-        sb_rs.pseudocode_line  = 4
-        sb_rs.explanation      = f"── Round {round_idx} of {V-1}: scan all edges ──"
-        sb_rs.overlay["round"]     = round_idx
-        sb_rs.overlay["distances"] = dict(dist)
-        yield sb_rs.build(step_number=step_no)
-        step_no += 1
+        if detail != "full":
+            dirty = _relax_round(src, tgt, w, edge_ids, arcs, dist, parent, via, batch)   # silent kernel
+            any_relaxed = bool(dirty)
+        else:
+            any_relaxed = False
+            n_dirty     = len(dirty)
+            dirty       = set()
 
-        for u, v, w, edge_obj in all_edges:
-            # skip blocked
-            u_node = graph.get_node(u)
-            v_node = graph.get_node(v)
-            if (u_node and u_node.blocked) or (v_node and v_node.blocked):
-                continue
-
-            if dist[u] == INF:
-                continue   # can't relax from an unreachable node
-
-            new_dist = dist[u] + w
-
-            sb_e = StepBuilder()
-            sb_e.set_current(u)
-            sb_e.relax_edge(edge_obj.id)
-            sb_e.distances        = dict(dist)
-            sb_e.pseudocode_line  = 6
-            sb_e.overlay["round"]     = round_idx
-            sb_e.overlay["distances"] = dict(dist)
-
-            if new_dist < dist[v]:
-                dist[v]   = new_dist
-                parent[v] = u
-                any_relaxed = True
-                sb_e.distances = dict(dist)     # update snapshot
-                sb_e.node_states[v] = "frontier"
-                sb_e.explanation = (
-                    f"Relax {u}→{v} (w={w}): {dist[u]} + {w} = {new_dist} "
-                    f"< old {dist[v] if dist[v] != new_dist else '∞'} → UPDATE dist[{v}] = {new_dist}"
-                )
-                sb_e.overlay["distances"] = dict(dist)
-            else:
-                sb_e.edge_states[edge_obj.id] = "ignored"
-                sb_e.explanation = (
-                    f"Edge {u}→{v} (w={w}): {dist[u]} + {w} = {new_dist} "
-                    f"≥ {dist[v]} — no change."
-                )
-
-            yield sb_e.build(step_number=step_no)
+            # -- round-start step --
+            sb.reset()
+            sb.distances        = _dist_map(ids, dist)
+            sb.pseudocode_line  = 4
+            sb.explanation      = (
+                f"── Round {round_idx} of {V-1}: scan the {len(arcs)} edge(s) leaving "
+                f"the {n_dirty} node(s) whose dist changed last round ──"
+            )
+            sb.overlay["round"]     = round_idx
+            sb.overlay["distances"] = _dist_map(ids, dist)
+            keyframe = step_no
+            yield sb.build(step_number=step_no)
             step_no += 1
 
+            for k in arcs:
+                ui, vi = src[k], tgt[k]
+                u, v, wk = ids[ui], ids[vi], w[k]
+                new_dist = dist[ui] + wk
+
+                sb.reset()
+                sb.set_current(u)
+                sb.relax_edge(edge_ids[k])
+                sb.keyframe = keyframe   # no full map — deltas only
+                sb.pseudocode_line  = 6
+                sb.overlay["round"]     = round_idx
+
+                if new_dist < dist[vi]:
+                    sb.set_distance_delta(v, dist[vi], new_dist)
+                    dist[vi]   = new_dist
+                    parent[vi] = ui
+                    via[vi]    = k
+                    any_relaxed = True
+                    dirty.add(vi)
+                    sb.node_states[v] = "frontier"
+                    sb.explanation = (
+                        f"Relax {u}→{v} (w={wk}): {dist[ui]} + {wk} = {new_dist} "
+                        f"< old {dist[vi] if dist[vi] != new_dist else '∞'} → UPDATE dist[{v}] = {new_dist}"
+                    )
+                else:
+                    sb.edge_states[edge_ids[k]] = "ignored"
+                    sb.explanation = (
+                        f"Edge {u}→{v} (w={wk}): {dist[ui]} + {wk} = {new_dist} "
+                        f"≥ {dist[vi]} — no change."
+                    )
+
+                yield sb.build(step_number=step_no)
+                step_no += 1
+
+        if detail == "final":
+            if not any_relaxed:
+                break
+            continue
+
         # -- round-end summary --
-        sb_re = StepBuilder()
-        sb_re.distances        = dict(dist)
-        sb_re.pseudocode_line  = 4
-        sb_re.overlay["round"]     = round_idx
-        sb_re.overlay["distances"] = dict(dist)
+        sb.reset()
+        if detail == "round":
+            _attach_batch(sb, ids, batch, mark_edges=True)
+            batch = []
+        sb.distances        = _dist_map(ids, dist)
+        sb.pseudocode_line  = 4
+        sb.overlay["round"]     = round_idx
+        sb.overlay["distances"] = _dist_map(ids, dist)
         if not any_relaxed:
-            sb_re.explanation = (
+            sb.explanation = (
                 f"Round {round_idx}: no relaxation occurred → distances converged early! "
                 f"Remaining rounds can be skipped."
             )
             # early termination
-            yield sb_re.build(step_number=step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
             break
         else:
-            sb_re.explanation = f"Round {round_idx} complete."
-            yield sb_re.build(step_number=step_no)
+            sb.explanation = f"Round {round_idx} complete."
+            yield sb.build(step_number=step_no)
             step_no += 1
 
     # ==============================================================
     # NEGATIVE-CYCLE DETECTOR (round V)
     # ==============================================================
-    sb_det = StepBuilder()
-    sb_det.distances        = dict(dist)
-    sb_det.pseudocode_line  = 10
-    sb_det.explanation      = "Negative-cycle detector round: one more pass over all edges…"
-    sb_det.overlay["round"]     = V
-    sb_det.overlay["distances"] = dict(dist)
-    yield sb_det.build(step_number=step_no)
-    step_no += 1
+    if detail != "final":
+        sb.reset()
+        sb.distances        = _dist_map(ids, dist)
+        sb.pseudocode_line  = 10
+        sb.explanation      = "Negative-cycle detector round: one more pass over all edges…"
+        sb.overlay["round"]     = V
+        sb.overlay["distances"] = _dist_map(ids, dist)
+        yield sb.build(step_number=step_no)
+        step_no += 1
 
-    negative_cycle = False
-    for u, v, w, edge_obj in all_edges:
-        u_node = graph.get_node(u)
-        v_node = graph.get_node(v)
-        if (u_node and u_node.blocked) or (v_node and v_node.blocked):
+    for k in live_arcs:
+        ui, vi = src[k], tgt[k]
+        if dist[ui] == INF:
             continue
-        if dist[u] == INF:
-            continue
-        if dist[u] + w < dist[v]:
-            negative_cycle = True
-            sb_nc = StepBuilder()
-            sb_nc.distances        = dict(dist)
-            sb_nc.pseudocode_line  = 12
-            sb_nc.explanation      = (
-                f"⚠️ NEGATIVE CYCLE detected via edge {u}→{v} (w={w}): "
-                f"dist[{u}]+{w} = {dist[u]+w} < dist[{v}]={dist[v]}. "
+        if dist[ui] + w[k] < dist[vi]:
+            u, v, wk = ids[ui], ids[vi], w[k]
+            sb.reset()
+            sb.distances        = _dist_map(ids, dist)
+            sb.pseudocode_line  = 12
+            sb.explanation      = (
+                f"⚠️ NEGATIVE CYCLE detected via edge {u}→{v} (w={wk}): "
+                f"dist[{u}]+{wk} = {dist[ui]+wk} < dist[{v}]={dist[vi]}. "
                 f"Shortest paths are undefined!"
             )
-            sb_nc.overlay["negative_cycle"] = True
-            sb_nc.overlay["distances"]      = dict(dist)
-            yield sb_nc.build(step_number=step_no, is_final=True)
+            sb.overlay["negative_cycle"] = True
+            sb.overlay["distances"]      = _dist_map(ids, dist)
+            _attach_batch(sb, ids, batch)
+            yield sb.build(step_number=step_no, is_final=True)
             return
 
     # ==============================================================
     # PATH RECONSTRUCTION
     # ==============================================================
-    if dist[target] == INF:
-        sb_nf = StepBuilder()
-        sb_nf.distances        = dict(dist)
-        sb_nf.pseudocode_line  = 13
-        sb_nf.explanation      = f"No negative cycle, but '{target}' is unreachable (dist = ∞)."
-        sb_nf.overlay["negative_cycle"] = False
-        sb_nf.overlay["distances"]      = dict(dist)
-        yield sb_nf.build(step_number=step_no, is_final=True)
+    t_idx = soa.index.get(target)
+    if t_idx is None or dist[t_idx] == INF:
+        sb.reset()
+        sb.distances        = _dist_map(ids, dist)
+        sb.pseudocode_line  = 13
+        sb.explanation      = f"No negative cycle, but '{target}' is unreachable (dist = ∞)."
+        sb.overlay["negative_cycle"] = False
+        sb.overlay["distances"]      = _dist_map(ids, dist)
+        _attach_batch(sb, ids, batch)
+        yield sb.build(step_number=step_no, is_final=True)
         return
 
-    path = _reconstruct(parent, target)
-    sb_fin = StepBuilder()
-    sb_fin.distances        = dict(dist)
-    sb_fin.pseudocode_line  = 13
-    sb_fin.set_path(path)
-    sb_fin.explanation      = (
+    path, path_edges = reconstruct_path(ids, edge_ids, parent, via, t_idx)
+    sb.reset()
+    sb.distances        = _dist_map(ids, dist)
+    sb.pseudocode_line  = 13
+    sb.set_path(path)
+    sb.explanation      = (
         f"✅ No negative cycle. Shortest path to '{target}': "
-        f"{' → '.join(path)}, cost = {dist[target]}."
+        f"{' → '.join(path)}, cost = {dist[t_idx]}."
     )
-    for i in range(len(path) - 1):
-        e = graph.get_edge_between(path[i], path[i + 1])
-        if e:
-            sb_fin.choose_edge(e.id)
-    sb_fin.overlay["negative_cycle"] = False
-    sb_fin.overlay["distances"]      = dict(dist)
-    yield sb_fin.build(step_number=step_no, is_final=True)
+    for eid in path_edges:
+        sb.choose_edge(eid)
+    sb.overlay["negative_cycle"] = False
+    sb.overlay["distances"]      = _dist_map(ids, dist)
+    _attach_batch(sb, ids, batch)
+    yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path, cur = [], target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+# Helpers
+# ---------------------------------------------------------------------------
+def _relax_round(
+    src: List[int], tgt: List[int], w: List[float], eids: List[str],
+    arcs: List[int], dist: MutableSequence[float], parent: MutableSequence[int],
+    via: MutableSequence[int], log: List,
+) -> Set[int]:
+    """
+    One silent, synchronous pass over the arc indices in `arcs` — no
+    StepBuilder, no snapshots.  Candidates dist[src]+w are computed in bulk
+    from the round-start distances (map/zip run in C, no per-arc bytecode),
+    then only the arcs that beat dist[tgt] are scattered back with a
+    running min.  Mutates dist / parent / via in place and returns the set of
+    nodes that improved (next round's dirty set).  Each applied relaxation
+    is appended to `log` as (edge_id, u_idx, v_idx, new_dist).
+    """
+    a_src  = list(map(src.__getitem__, arcs))
+    a_tgt  = list(map(tgt.__getitem__, arcs))
+    cand   = list(map(add, map(dist.__getitem__, a_src), map(w.__getitem__, arcs)))
+    better = compress(range(len(arcs)), map(lt, cand, map(dist.__getitem__, a_tgt)))
+    improved: Set[int] = set()
+    for i in list(better):
+        v, c = a_tgt[i], cand[i]
+        if c < dist[v]:                 # several arcs may hit v: keep the min
+            dist[v]   = c
+            parent[v] = a_src[i]
+            via[v]    = arcs[i]
+            improved.add(v)
+            log.append((eids[arcs[i]], a_src[i], v, c))
+    return improved
+
+def _attach_batch(sb: StepBuilder, ids: List[str], batch: List, mark_edges: bool = False) -> None:
+    """Fold silently-applied relaxations into `sb` (with string node ids)."""
+    for eid, ui, vi, d in batch:
+        sb.add_batched_relaxation(eid, ids[ui], ids[vi], d)
+        if mark_edges:
+            sb.edge_states[eid] = "relaxed"
+
+def _dist_map(ids: List[str], dist: Sequence[float]) -> Dict[str, float]:
+    """{node_id: distance} view of the index-addressed distance list."""
+    return dict(zip(ids, dist))
@@ -11,13 +11,30 @@ Pseudocode lines are 0-indexed and match the PSEUDOCODE constant
 exported alongside the generator so the UI can highlight them live.
 
 Skips blocked nodes transparently.
+
+The search itself runs in `_kernels.bfs_kernel` over the CSR lists; the
+generator replays the kernel's event trace into Steps.
+
+`detail` levels (see `algorithms.dijkstra`):
+  • "full"  – one Step per event above (default).
+  • "round" – one Step per dequeued node; its enqueues are listed in
+              `batched_relaxations` as (edge_id, node, neighbour, hops).
+  • "final" – only the init and final Steps; the final one carries every
+              enqueue of the run.  Headless callers get the path for the
+              cost of the kernel alone.
+
+Steps are delta-encoded (see algorithms.step.StepDeltas): each carries
+only the visited / queue changes it made, plus a periodic keyframe, so a
+step costs O(1) instead of O(V).  Use `algorithms.step.materialize` for
+a flat view.
 """
 
-from typing import Generator, Optional, List, Dict
-from collections import deque
+from array import array
+from typing import Generator, List, Tuple
 
 from graph import Graph
-from algorithms.step import Step, StepBuilder
+from algorithms.step import Step, StepBuilder, StepDeltas
+from algorithms._kernels import bfs_kernel, reconstruct_path, DEQUEUE, EDGE_NEW, EDGE_SEEN, FOUND
 
 
 # ---------------------------------------------------------------------------
@@ -47,6 +64,7 @@ def bfs(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
     """
     Yields Step snapshots for every event during BFS execution.
@@ -55,52 +73,87 @@ def bfs(
         graph  : The graph to search.
         source : Starting node id.
         target : Goal node id.
+        detail : "full" (one Step per event), "round" (one per dequeue) or
+                 "final" (init + final only) — see module docstring.
 
     Yields:
         Step – one per event (dequeue, neighbour-check, enqueue, path-found).
     """
 
+    ids, index, indptr, nbrs, _, edge_ids, blocked = graph.as_csr(source)
+    s = index[source]
+    t = index.get(target, -1)
+
+    # the search itself runs first, in the int-only kernel; this generator
+    # replays its event trace and builds one Step per event
+    parent, via, events = bfs_kernel(indptr, nbrs, blocked, s, t)
+
     sb      = StepBuilder()
     step_no = 0
-    queue   = deque([source])
-    visited: set  = {source}
-    parent:  Dict[str, Optional[str]] = {source: None}
+    queue   = [s]                          # replayed queue (live part: queue[head:]),
+    head    = 0                            # for keyframe snapshots
+
+    # visited / queue / frontier colours go out as per-step deltas
+    d = StepDeltas()
+    queued = lambda: [ids[queue[i]] for i in range(head, len(queue))]
+    d.track("frontier", queued)            # one shared snapshot per keyframe
+    d.track("queue",    queued)
+    d.paint(source, "frontier")
 
     # --- initialisation step ---
     sb.set_current(source)
-    sb.set_frontier([source])
     sb.pseudocode_line = 1
     sb.explanation = (
         f"Initialise: source node '{source}' is placed into the queue "
         f"and marked as visited. BFS explores layer by layer from here."
     )
-    sb.overlay["queue"] = list(queue)
+    d.stamp(sb, step_no)
+    sb.visited_set = []                    # source is reported visited from the next step
     yield sb.build(step_number=step_no)
     step_no += 1
+    d.add_visited(source)
 
-    # --- main loop ---
-    while queue:
-        node = queue.popleft()
+    # coarser detail levels fold events into the next emitted Step: the
+    # StepDeltas above simply accumulate until then, enqueues go to `batch`
+    full      = detail == "full"
+    hops      = array("i", [0]) * len(ids)
+    batch: List[Tuple[str, str, str, float]] = []
+    expanding = ""                         # detail="round": node whose Step is still open
+
+    # --- replay ---
+    for ev in range(0, len(events), 3):
+        op, u, k = events[ev], events[ev + 1], events[ev + 2]
+        node = ids[u]
 
         # -- dequeue event --
-        sb.reset()
-        sb.visited_set      = list(visited)
-        sb.set_current(node)
-        sb.set_frontier(list(queue))
-        sb.pseudocode_line  = 5
-        sb.explanation      = (
-            f"Dequeue node '{node}' — it is now the CURRENT node being expanded. "
-            f"BFS always dequeues the node that was discovered earliest (FIFO)."
-        )
-        sb.overlay["queue"] = list(queue)
-        yield sb.build(step_number=step_no)
-        step_no += 1
+        if op == DEQUEUE:
+            if expanding:                  # close the previous expansion's Step
+                _round_step(sb, expanding, batch)
+                batch = []
+                d.stamp(sb, step_no)
+                yield sb.build(step_number=step_no)
+                step_no += 1
+            sb.reset()
+            head += 1
+            d.popleft(node, "queue", "frontier")
+            d.paint(node, None)
+            if not full:
+                if detail == "round":
+                    sb.set_current(node)
+                    expanding = node
+                continue
+            sb.set_current(node)
+            sb.pseudocode_line  = 5
+            sb.explanation      = (
+                f"Dequeue node '{node}' — it is now the CURRENT node being expanded. "
+                f"BFS always dequeues the node that was discovered earliest (FIFO)."
+            )
 
         # -- target check --
-        if node == target:
-            path = _reconstruct(parent, target)
+        elif op == FOUND:
             sb.reset()
-            sb.visited_set     = list(visited)
+            path, path_edges = reconstruct_path(ids, edge_ids, parent, via, u)
+            sb.visited_set     = list(d.visited)
             sb.pseudocode_line = 6
             sb.set_path(path)
             sb.explanation     = (
@@ -109,82 +162,90 @@ def bfs(
                 f"{' → '.join(path)}"
             )
             # mark path edges
-            for i in range(len(path) - 1):
-                e = graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    sb.choose_edge(e.id)
-            sb.overlay["queue"] = list(queue)
+            for eid in path_edges:
+                sb.choose_edge(eid)
+            sb.overlay["queue"] = [ids[queue[i]] for i in range(head, len(queue))]
+            for eid, a, b, h in batch:
+                sb.add_batched_relaxation(eid, a, b, h)
             yield sb.build(step_number=step_no, is_final=True)
             return
 
-        # -- explore neighbours --
-        for nbr, edge in graph.neighbours(node):
-            # skip blocked
-            nbr_node = graph.get_node(nbr)
-            if nbr_node and nbr_node.blocked:
+        # -- edge-examination step --
+        elif op == EDGE_NEW or op == EDGE_SEEN:
+            nbr, eid = ids[nbrs[k]], edge_ids[k]
+            if not full:
+                if op == EDGE_SEEN and expanding:
+                    sb.edge_states[eid] = "ignored"
                 continue
-
-            # -- edge-examination step --
-            sb_edge = StepBuilder()
-            sb_edge.visited_set     = list(visited)
-            sb_edge.set_current(node)
-            sb_edge.set_frontier(list(queue))
-            sb_edge.relax_edge(edge.id)
-            sb_edge.pseudocode_line = 7
-
-            if nbr in visited:
-                sb_edge.explanation = (
+            sb.reset_edge_event(node, eid, 7)
+            if op == EDGE_SEEN:
+                sb.explanation = (
                     f"Examine edge {node}→{nbr}: neighbour '{nbr}' already visited — skip."
                 )
-                sb_edge.edge_states[edge.id] = "ignored"
+                sb.edge_states[eid] = "ignored"
             else:
-                sb_edge.explanation = (
+                sb.explanation = (
                     f"Examine edge {node}→{nbr}: neighbour '{nbr}' is NEW — "
                     f"enqueue it and mark visited."
                 )
-            sb_edge.overlay["queue"] = list(queue)
-            yield sb_edge.build(step_number=step_no)
-            step_no += 1
-
-            if nbr not in visited:
-                visited.add(nbr)
-                parent[nbr] = node
-                queue.append(nbr)
-
-                # -- enqueue event --
-                sb_enq = StepBuilder()
-                sb_enq.visited_set     = list(visited)
-                sb_enq.set_current(node)
-                sb_enq.set_frontier(list(queue))
-                sb_enq.node_states[nbr] = "frontier"
-                sb_enq.pseudocode_line = 11
-                sb_enq.explanation     = (
-                    f"Enqueue '{nbr}' (parent = '{node}'). "
-                    f"It will be expanded after all nodes at the current depth."
-                )
-                sb_enq.overlay["queue"] = list(queue)
-                yield sb_enq.build(step_number=step_no)
-                step_no += 1
+
+        # -- enqueue event --
+        else:
+            j   = nbrs[k]
+            nbr = ids[j]
+            queue.append(j)
+            d.add_visited(nbr)
+            d.push(nbr, "queue", "frontier")
+            d.paint(nbr, "frontier")
+            if not full:
+                hops[j] = hops[u] + 1
+                batch.append((edge_ids[k], node, nbr, float(hops[j])))
+                if expanding:
+                    sb.edge_states[edge_ids[k]] = "relaxed"
+                    sb.node_states[nbr] = "frontier"
+                continue
+            sb.reset()
+            sb.set_current(node)
+            sb.node_states[nbr] = "frontier"
+            sb.pseudocode_line = 11
+            sb.explanation     = (
+                f"Enqueue '{nbr}' (parent = '{node}'). "
+                f"It will be expanded after all nodes at the current depth."
+            )
+
+        d.stamp(sb, step_no)
+        yield sb.build(step_number=step_no)
+        step_no += 1
+
+    if expanding:
+        _round_step(sb, expanding, batch)
+        batch = []
+        d.stamp(sb, step_no)
+        yield sb.build(step_number=step_no)
+        step_no += 1
 
     # --- exhausted without finding target ---
     sb.reset()
-    sb.visited_set     = list(visited)
+    sb.visited_set     = list(d.visited)
     sb.pseudocode_line = 12
     sb.explanation     = (
         f"Queue is empty. Target '{target}' is NOT reachable from '{source}'."
     )
     sb.overlay["queue"] = []
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
     yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
-# Helper
+# Helpers
 # ---------------------------------------------------------------------------
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path = []
-    cur: Optional[str] = target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+def _round_step(sb: StepBuilder, node: str, batch: List[Tuple[str, str, str, float]]) -> None:
+    """Finish the condensed detail="round" Step for one dequeued node."""
+    sb.pseudocode_line = 7
+    sb.explanation     = (
+        f"Expand '{node}': {len(sb.edge_states)} neighbour(s) examined, "
+        f"{len(batch)} enqueued."
+    )
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
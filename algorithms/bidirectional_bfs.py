@@ -13,15 +13,29 @@ Overlay exposes:
   • "queue_forward"  – current forward queue
   • "queue_backward" – current backward queue
 
+Steps are delta-encoded (algorithms.step.StepDeltas): queues, the
+visited set (forward ∪ backward) and the colours above are sent as
+changes plus a periodic keyframe.  Colours are sticky, so a node keeps
+its frontier / visited colour across forward and backward steps.
+
+`detail` levels (see `algorithms.dijkstra`):
+  • "full"  – one Step per expansion and per edge (default).
+  • "round" – one Step per expansion; its enqueues are listed in
+              `batched_relaxations` as (edge_id, node, neighbour, hops
+              from that side's root).
+  • "final" – only the init and final Steps; the final one carries every
+              enqueue of the run.
+
 This is the canonical way to show WHY bidirectional search explores
 far fewer nodes than single-source BFS on large graphs.
 """
 
-from typing import Generator, Optional, List, Dict, Set
+from array import array
+from typing import Generator, List, Tuple
 from collections import deque
 
 from graph import Graph
-from algorithms.step import Step, StepBuilder
+from algorithms.step import Step, StepBuilder, StepDeltas
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +59,31 @@ PSEUDOCODE: List[str] = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Per-direction search state
+# ---------------------------------------------------------------------------
+class _Side:
+    """One direction of the search: its queue, visited bytes, parents and depths."""
+
+    __slots__ = ("queue", "visited", "parent", "via", "depth", "count",
+                 "qname", "colour", "line", "label", "tag")
+
+    def __init__(self, root: int, V: int, qname: str, colour: str,
+                 line: int, label: str, tag: str):
+        self.queue:   deque     = deque([root])
+        self.visited: bytearray = bytearray(V)
+        self.parent:  array     = array("i", [-1]) * V
+        self.via:     array     = array("i", [-1]) * V    # arc slot that reached each node
+        self.depth:   array     = array("i", [0]) * V     # hops from this side's root
+        self.count:   int       = 1                       # == visited.count(1), kept as we go
+        self.visited[root] = 1
+        self.qname:   str       = qname     # its queue's overlay key
+        self.colour:  str       = colour    # sticky colour of its frontier
+        self.line:    int       = line      # pseudocode line of "expand one layer"
+        self.label:   str       = label     # "Forward" / "Backward" …
+        self.tag:     str       = tag       # … and "Fwd" / "Bwd" in explanations
+
+
 # ---------------------------------------------------------------------------
 # Generator
 # ---------------------------------------------------------------------------
@@ -52,19 +91,33 @@ def bidirectional_bfs(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
+    """
+    `detail` is "full" (one Step per expansion and edge), "round" (one per
+    expansion) or "final" (init + final only) — see module docstring.
+    """
 
     step_no = 0
 
-    # forward state
-    qF:       deque          = deque([source])
-    visitedF: Set[str]       = {source}
-    parentF:  Dict[str, Optional[str]] = {source: None}
-
-    # backward state
-    qB:       deque          = deque([target])
-    visitedB: Set[str]       = {target}
-    parentB:  Dict[str, Optional[str]] = {target: None}
+    ids, index, indptr, nbrs, _, edge_ids, blocked = graph.as_csr(source, target)
+    s, t = index[source], index[target]
+    V    = len(ids)
+
+    # per-direction state: forward from the source, backward to the target
+    fwd = _Side(s, V, "queue_forward",  "frontier",   6,  "Forward",  "Fwd")
+    bwd = _Side(t, V, "queue_backward", "frontier_b", 10, "Backward", "Bwd")
+
+    # visited_set (F ∪ B), both queues and the node colours go out as
+    # per-step deltas; colours are sticky hints (forward frontier,
+    # backward frontier, visited) painted once when they change instead of
+    # re-colouring every visited node on every step
+    d = StepDeltas()
+    d.track("queue_forward",  lambda: [ids[i] for i in fwd.queue])
+    d.track("queue_backward", lambda: [ids[i] for i in bwd.queue])
+    d.paint(source, "frontier")
+    if target != source:
+        d.paint(target, "frontier_b")
 
     # -- init step --
     sb = StepBuilder()
@@ -75,186 +128,178 @@ def bidirectional_bfs(
         f"Bidirectional BFS: launch two frontiers — "
         f"forward from '{source}' and backward from '{target}'."
     )
-    sb.overlay["queue_forward"]  = list(qF)
-    sb.overlay["queue_backward"] = list(qB)
+    d.stamp(sb, step_no)
     yield sb.build(step_number=step_no)
     step_no += 1
-
-    # helper: check collision after expanding
-    def find_meeting(expanded_set: Set[str], other_visited: Set[str]) -> Optional[str]:
-        intersection = expanded_set & other_visited
-        return next(iter(intersection)) if intersection else None
-
-    # --- main loop (layer-by-layer) ---
-    while qF or qB:
-
-        # ============================================================
-        # FORWARD EXPANSION — one full layer
-        # ============================================================
-        if qF:
-            layer_size = len(qF)
-            new_frontier_f: Set[str] = set()
-
-            for _ in range(layer_size):
-                node = qF.popleft()
-
-                # -- dequeue step --
-                sb2 = StepBuilder()
-                sb2.visited_set = list(visitedF)
-                sb2.set_current(node)
-                sb2.visit(node)
-                sb2.pseudocode_line = 6
-                sb2.explanation = f"[Forward] Expand '{node}'."
-                # colour backward frontier differently
-                for n in visitedB:
-                    if n not in visitedF:
-                        sb2.node_states[n] = "frontier_b"
-                sb2.overlay["queue_forward"]  = list(qF)
-                sb2.overlay["queue_backward"] = list(qB)
-                yield sb2.build(step_number=step_no)
+    d.add_visited(source)                  # reported visited from the next step on
+    if target != source:
+        d.add_visited(target)
+
+    # coarser detail levels skip the per-edge Steps; the StepDeltas above
+    # accumulate until the next emitted Step, enqueues go to `batch`
+    full  = detail == "full"
+    batch: List[Tuple[str, str, str, float]] = []
+
+    # one full layer of `me`; returns the meeting node idx, or -1
+    def expand_layer(me: _Side, other: _Side) -> Generator[Step, None, int]:
+        nonlocal step_no, batch
+        hits: List[int] = []               # newly reached nodes `other` has seen
+
+        for _ in range(len(me.queue)):
+            u    = me.queue.popleft()
+            node = ids[u]
+            d.popleft(node, me.qname)
+            d.paint(node, "visited")
+
+            # -- dequeue step --
+            sb.reset()
+            sb.set_current(node)
+            if me is fwd:
+                sb.visit(node)
+                sb.metrics["nodes_visited"] = me.count
+            else:
+                sb.node_states[node] = "visited"
+            sb.pseudocode_line = me.line
+            sb.explanation = f"[{me.label}] Expand '{node}'."
+            if full:
+                d.stamp(sb, step_no)
+                yield sb.build(step_number=step_no)
                 step_no += 1
 
-                for nbr, edge in graph.neighbours(node):
-                    nbr_node = graph.get_node(nbr)
-                    if nbr_node and nbr_node.blocked:
-                        continue
-
-                    sb_e = StepBuilder()
-                    sb_e.visited_set = list(visitedF)
-                    sb_e.set_current(node)
-                    sb_e.relax_edge(edge.id)
-                    sb_e.pseudocode_line = 6
-                    for n in visitedB:
-                        if n not in visitedF:
-                            sb_e.node_states[n] = "frontier_b"
-
-                    if nbr not in visitedF:
-                        visitedF.add(nbr)
-                        parentF[nbr] = node
-                        qF.append(nbr)
-                        new_frontier_f.add(nbr)
-                        sb_e.node_states[nbr] = "frontier"
-                        sb_e.explanation = f"[Fwd] Edge {node}→{nbr}: enqueue '{nbr}'."
+            for k in range(indptr[u], indptr[u + 1]):
+                j = nbrs[k]
+                if blocked[j]:
+                    continue
+
+                nbr = ids[j]
+                eid = edge_ids[k]
+
+                if full:
+                    sb.reset_edge_event(node, eid, me.line)
+
+                if not me.visited[j]:
+                    me.visited[j] = 1
+                    me.count     += 1
+                    me.parent[j]  = u
+                    me.via[j]     = k
+                    me.depth[j]   = me.depth[u] + 1
+                    me.queue.append(j)
+                    d.push(nbr, me.qname)
+                    if other.visited[j]:       # collision, caught at enqueue
+                        hits.append(j)
                     else:
-                        sb_e.edge_states[edge.id] = "ignored"
-                        sb_e.explanation = f"[Fwd] Edge {node}→{nbr}: already visited."
-
-                    sb_e.overlay["queue_forward"]  = list(qF)
-                    sb_e.overlay["queue_backward"] = list(qB)
-                    yield sb_e.build(step_number=step_no)
-                    step_no += 1
-
-            # collision check
-            meeting = find_meeting(new_frontier_f, visitedB)
-            if meeting:
-                path = _build_path(parentF, parentB, meeting)
-                yield from _final_step(step_no, path, graph, visitedF, visitedB)
-                return
+                        d.add_visited(nbr)
+                        d.paint(nbr, me.colour)
+                    sb.node_states[nbr] = me.colour
+                    if not full:
+                        sb.edge_states[eid] = "relaxed"
+                        batch.append((eid, node, nbr, float(me.depth[j])))
+                        continue
+                    sb.explanation = f"[{me.tag}] Edge {node}→{nbr}: enqueue '{nbr}'."
+                else:
+                    sb.edge_states[eid] = "ignored"
+                    if not full:
+                        continue
+                    sb.explanation = f"[{me.tag}] Edge {node}→{nbr}: already visited."
 
-        # ============================================================
-        # BACKWARD EXPANSION — one full layer
-        # ============================================================
-        if qB:
-            layer_size = len(qB)
-            new_frontier_b: Set[str] = set()
-
-            for _ in range(layer_size):
-                node = qB.popleft()
-
-                sb3 = StepBuilder()
-                sb3.visited_set = list(visitedB)
-                sb3.set_current(node)
-                sb3.node_states[node] = "visited"
-                sb3.pseudocode_line = 10
-                sb3.explanation = f"[Backward] Expand '{node}'."
-                for n in visitedF:
-                    sb3.node_states[n] = "visited"
-                sb3.overlay["queue_forward"]  = list(qF)
-                sb3.overlay["queue_backward"] = list(qB)
-                yield sb3.build(step_number=step_no)
+                d.stamp(sb, step_no)
+                yield sb.build(step_number=step_no)
                 step_no += 1
 
-                for nbr, edge in graph.neighbours(node):
-                    nbr_node = graph.get_node(nbr)
-                    if nbr_node and nbr_node.blocked:
-                        continue
+            # -- one condensed step per expansion --
+            if detail == "round":
+                sb.explanation += f" {len(batch)} neighbour(s) enqueued."
+                for eid, a, b, h in batch:
+                    sb.add_batched_relaxation(eid, a, b, h)
+                batch = []
+                d.stamp(sb, step_no)
+                yield sb.build(step_number=step_no)
+                step_no += 1
 
-                    sb_e2 = StepBuilder()
-                    sb_e2.visited_set = list(visitedB)
-                    sb_e2.set_current(node)
-                    sb_e2.relax_edge(edge.id)
-                    sb_e2.pseudocode_line = 10
-                    for n in visitedF:
-                        sb_e2.node_states[n] = "visited"
-
-                    if nbr not in visitedB:
-                        visitedB.add(nbr)
-                        parentB[nbr] = node
-                        qB.append(nbr)
-                        new_frontier_b.add(nbr)
-                        sb_e2.node_states[nbr] = "frontier_b"
-                        sb_e2.explanation = f"[Bwd] Edge {node}→{nbr}: enqueue '{nbr}'."
-                    else:
-                        sb_e2.edge_states[edge.id] = "ignored"
-                        sb_e2.explanation = f"[Bwd] Edge {node}→{nbr}: already visited."
-
-                    sb_e2.overlay["queue_forward"]  = list(qF)
-                    sb_e2.overlay["queue_backward"] = list(qB)
-                    yield sb_e2.build(step_number=step_no)
-                    step_no += 1
-
-            # collision check
-            meeting = find_meeting(new_frontier_b, visitedF)
-            if meeting:
-                path = _build_path(parentF, parentB, meeting)
-                yield from _final_step(step_no, path, graph, visitedF, visitedB)
+        # every node of the new layer is equally far from this side, so the
+        # best meeting node is the one closest to the other side (ties: first)
+        return min(hits, key=other.depth.__getitem__) if hits else -1
+
+    # --- main loop: one full layer forward, then one backward ---
+    # Stops as soon as a side that can decide it runs dry without a
+    # collision.  The forward side always can: it has reached everything
+    # reachable from the source, and the target (in visitedB) was not among
+    # it.  The backward side walks the same arcs as the forward one, so only
+    # on an undirected graph does its running dry mean the target's whole
+    # component is seen.  Either way, no point running the other side on.
+    conclusive = (fwd,) if graph.directed else (fwd, bwd)
+    stalled    = False
+    while (fwd.queue or bwd.queue) and not stalled:
+        for me, other in ((fwd, bwd), (bwd, fwd)):
+            if not me.queue:
+                continue
+            meeting = yield from expand_layer(me, other)
+            if meeting != -1:
+                path, path_edges = _build_path(ids, edge_ids, fwd, bwd, meeting)
+                yield _final_step(sb, step_no, path, path_edges, d.visited, batch)
                 return
+            if not me.queue and me in conclusive:
+                stalled = True
+                break
 
     # --- not found ---
-    sb_fin = StepBuilder()
-    sb_fin.visited_set     = list(visitedF | visitedB)
-    sb_fin.pseudocode_line = 13
-    sb_fin.explanation     = "Both frontiers exhausted — target not reachable."
-    yield sb_fin.build(step_number=step_no, is_final=True)
+    sb.reset()
+    sb.visited_set     = list(d.visited)
+    sb.pseudocode_line = 13
+    sb.explanation     = (
+        f"{'Forward' if not fwd.queue else 'Backward'} frontier exhausted "
+        f"without meeting the other — target not reachable."
+    )
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
+    yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 def _build_path(
-    parentF: Dict[str, Optional[str]],
-    parentB: Dict[str, Optional[str]],
-    meeting: str,
-) -> List[str]:
+    ids:      List[str],
+    edge_ids: List[str],
+    fwd:      "_Side",
+    bwd:      "_Side",
+    meeting:  int,
+) -> Tuple[List[str], List[str]]:
+    """(path node ids, path edge ids) source → meeting → target."""
     # forward half: meeting → source (reversed)
-    fwd, cur = [], meeting
-    while cur is not None:
-        fwd.append(cur)
-        cur = parentF.get(cur)
-    fwd.reverse()
+    path, edges, cur = [], [], meeting
+    while cur != -1:
+        path.append(ids[cur])
+        if fwd.via[cur] != -1:
+            edges.append(edge_ids[fwd.via[cur]])
+        cur = fwd.parent[cur]
+    path.reverse()
+    edges.reverse()
 
     # backward half: meeting → target
-    bwd, cur = [], parentB.get(meeting)   # skip meeting (already in fwd)
-    while cur is not None:
-        bwd.append(cur)
-        cur = parentB.get(cur)
+    cur = meeting
+    while bwd.via[cur] != -1:
+        edges.append(edge_ids[bwd.via[cur]])
+        cur = bwd.parent[cur]
+        path.append(ids[cur])             # meeting itself is already in
 
-    return fwd + bwd
+    return path, edges
 
 
-def _final_step(step_no, path, graph, visitedF, visitedB):
-    sb = StepBuilder()
-    sb.visited_set = list(visitedF | visitedB)
+def _final_step(sb: StepBuilder, step_no: int, path: List[str], path_edges: List[str],
+                visited: List[str], batch: List[Tuple[str, str, str, float]]) -> Step:
+    sb.reset()
+    sb.visited_set = list(visited)
     sb.set_path(path)
     sb.pseudocode_line = 8
     sb.explanation = (
         f"🎯 Frontiers met at '{path[len(path)//2] if path else '?'}'! "
         f"Path: {' → '.join(path)} ({len(path)-1} edges). "
-        f"Total nodes explored: {len(visitedF | visitedB)} "
-        f"(vs potentially {len(visitedF | visitedB)*2} with single BFS)."
+        f"Total nodes explored: {len(visited)} "
+        f"(vs potentially {len(visited)*2} with single BFS)."
     )
-    for i in range(len(path) - 1):
-        e = graph.get_edge_between(path[i], path[i + 1])
-        if e:
-            sb.choose_edge(e.id)
-    yield sb.build(step_number=step_no, is_final=True)
+    for eid in path_edges:
+        sb.choose_edge(eid)
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
+    return sb.build(step_number=step_no, is_final=True)
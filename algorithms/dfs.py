@@ -12,13 +12,36 @@ Yields a Step at:
   6. Stack empty  →  NOT FOUND
 
 The overlay exposes the full stack at every step so the UI can render
-the "recursion stack" panel.
+the "recursion stack" panel.  Steps are delta-encoded (pushes / pops
+plus a periodic keyframe, see algorithms.step.StepDeltas); use
+`algorithms.step.materialize` for a flat view.
+
+The search itself runs in `_kernels.dfs_kernel` over the CSR lists; the
+generator replays the kernel's event trace into Steps.
+
+`detail` levels (see `algorithms.dijkstra`):
+  • "full"  – one Step per event above (default).
+  • "round" – one Step per visited node; its pushes are listed in
+              `batched_relaxations` as (edge_id, node, neighbour, depth).
+  • "final" – only the init and final Steps; the final one carries every
+              push of the run.
+
+`strategy` picks when a node counts as seen:
+  • "pop"  – when popped (default; what PSEUDOCODE shows).  A node can be
+             pushed once per visited neighbour, each stale copy costing a
+             pop and an "already visited, skip" Step later.
+  • "push" – when pushed: every node is stacked at most once, so no skip
+             Steps and a stack bounded by V.  On dense graphs that removes
+             most of the events (E - V pushes fewer); the visiting order is
+             no longer strictly depth-first.
 """
 
-from typing import Generator, Optional, List, Dict
+from array import array
+from typing import Generator, List, Dict, Tuple
 
 from graph import Graph
-from algorithms.step import Step, StepBuilder
+from algorithms.step import Step, StepBuilder, StepDeltas
+from algorithms._kernels import dfs_kernel, reconstruct_path, EDGE_NEW, EDGE_SEEN, FOUND, POP_SEEN, POP_VISIT
 
 
 # ---------------------------------------------------------------------------
@@ -49,6 +72,8 @@ def dfs(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
+    strategy: str = "pop",
 ) -> Generator[Step, None, None]:
     """
     Iterative DFS with parent tracking for path reconstruction.
@@ -57,130 +82,190 @@ def dfs(
     order than recursive DFS when a node is pushed multiple times before
     being popped.  We use the standard "mark on pop" strategy here because
     it keeps the generator simple and still finds a valid path.
+
+    `detail` is "full" (one Step per event), "round" (one per visited
+    node) or "final" (init + final only); `strategy` is "pop" (mark on
+    pop) or "push" (mark on push) — see module docstring.
     """
 
+    ids, index, indptr, nbrs, _, edge_ids, blocked = graph.as_csr(source)
+    s = index[source]
+    t = index.get(target, -1)
+
+    # the search itself runs first, in the int-only kernel; this generator
+    # replays its event trace and builds one Step per event
+    parent, via, events = dfs_kernel(indptr, nbrs, blocked, s, t,
+                                     on_push=strategy == "push")
+
     sb      = StepBuilder()
     step_no = 0
-    stack   = [source]
-    visited: set  = set()
-    parent:  Dict[str, Optional[str]] = {source: None}
+    stack   = [s]                          # replayed stack, for keyframe snapshots
+
+    # frontier = unvisited nodes on the stack, each once, ordered by its
+    # top-most copy; kept incrementally instead of re-filtering the stack
+    frontier: Dict[int, None] = {s: None}
+
+    # visited / stack / frontier colours go out as per-step deltas
+    d = StepDeltas()
+    d.track("frontier", lambda: [ids[i] for i in frontier])
+    d.track("stack",    lambda: [ids[i] for i in stack])
+    d.paint(source, "frontier")
 
     # --- init step ---
     sb.set_current(source)
-    sb.set_frontier([source])
     sb.pseudocode_line = 1
     sb.explanation = (
         f"Initialise: push source '{source}' onto the stack. "
         f"DFS dives as deep as possible before backtracking."
     )
-    sb.overlay["stack"] = list(stack)
+    d.stamp(sb, step_no)
     yield sb.build(step_number=step_no)
     step_no += 1
 
-    # --- main loop ---
-    while stack:
-        node = stack.pop()
+    # coarser detail levels fold events into the next emitted Step: the
+    # StepDeltas above simply accumulate until then, pushes go to `batch`
+    full      = detail == "full"
+    depth     = array("i", [0]) * len(ids)
+    batch: List[Tuple[str, str, str, float]] = []
+    expanding = ""                         # detail="round": node whose Step is still open
 
-        # already visited (can happen because we mark-on-pop)
-        if node in visited:
-            sb2 = StepBuilder()
-            sb2.visited_set     = list(visited)
-            sb2.set_frontier([n for n in stack if n not in visited])
-            sb2.pseudocode_line = 6
-            sb2.explanation     = f"Pop '{node}' — already visited, skip."
-            sb2.overlay["stack"] = list(stack)
-            yield sb2.build(step_number=step_no)
+    # --- replay ---
+    for ev in range(0, len(events), 3):
+        op, u, k = events[ev], events[ev + 1], events[ev + 2]
+        node = ids[u]
+
+        if expanding and (op == POP_SEEN or op == POP_VISIT):
+            _round_step(sb, expanding, batch)   # close the previous visit's Step
+            batch     = []
+            expanding = ""
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
-            continue
+
+        # already visited (can happen because we mark-on-pop)
+        if op == POP_SEEN:
+            stack.pop()
+            d.pop(node, "stack")
+            if not full:
+                continue
+            sb.reset()
+            sb.pseudocode_line = 6
+            sb.explanation     = f"Pop '{node}' — already visited, skip."
 
         # -- pop & visit --
-        visited.add(node)
-
-        sb3 = StepBuilder()
-        sb3.visited_set     = list(visited)
-        sb3.set_current(node)
-        sb3.visit(node)
-        sb3.set_frontier([n for n in stack if n not in visited])
-        sb3.pseudocode_line = 7
-        sb3.explanation     = (
-            f"Pop '{node}' from stack and mark VISITED. "
-            f"DFS will now explore its neighbours before returning here."
-        )
-        sb3.overlay["stack"] = list(stack)
-        yield sb3.build(step_number=step_no)
-        step_no += 1
+        elif op == POP_VISIT:
+            sb.reset()
+            stack.pop()
+            del frontier[u]
+            d.pop(node, "stack")
+            d.add_visited(node)
+            d.discard(node, "frontier")      # every stacked copy leaves the frontier
+            d.paint(node, None)
+            if not full:
+                if detail == "round":
+                    sb.set_current(node)
+                    sb.visit(node)
+                    sb.metrics["nodes_visited"] = len(d.visited)
+                    expanding = node
+                continue
+            sb.set_current(node)
+            sb.visit(node)
+            sb.metrics["nodes_visited"] = len(d.visited)
+            sb.pseudocode_line = 7
+            sb.explanation     = (
+                f"Pop '{node}' from stack and mark VISITED. "
+                f"DFS will now explore its neighbours before returning here."
+            )
 
         # -- target check --
-        if node == target:
-            path = _reconstruct(parent, target)
-            sb4 = StepBuilder()
-            sb4.visited_set     = list(visited)
-            sb4.pseudocode_line = 8
-            sb4.set_path(path)
-            sb4.explanation     = (
+        elif op == FOUND:
+            sb.reset()
+            path, path_edges = reconstruct_path(ids, edge_ids, parent, via, u)
+            sb.visited_set     = list(d.visited)
+            sb.pseudocode_line = 8
+            sb.set_path(path)
+            sb.explanation     = (
                 f"🎯 Target '{target}' found! Path: {' → '.join(path)} "
                 f"({len(path)-1} edge(s))."
             )
-            for i in range(len(path) - 1):
-                e = graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    sb4.choose_edge(e.id)
-            sb4.overlay["stack"] = list(stack)
-            yield sb4.build(step_number=step_no, is_final=True)
+            for eid in path_edges:
+                sb.choose_edge(eid)
+            sb.overlay["stack"] = [ids[i] for i in stack]
+            for eid, a, b, h in batch:
+                sb.add_batched_relaxation(eid, a, b, h)
+            yield sb.build(step_number=step_no, is_final=True)
             return
 
-        # -- explore neighbours --
-        for nbr, edge in graph.neighbours(node):
-            nbr_node = graph.get_node(nbr)
-            if nbr_node and nbr_node.blocked:
+        # -- edge examination --
+        elif op == EDGE_NEW or op == EDGE_SEEN:
+            nbr, eid = ids[nbrs[k]], edge_ids[k]
+            if not full:
+                if op == EDGE_SEEN and expanding:
+                    sb.edge_states[eid] = "ignored"
                 continue
+            sb.reset_edge_event(node, eid, 9)
+            if op == EDGE_SEEN:
+                sb.edge_states[eid] = "ignored"
+                sb.explanation = (
+                    f"Edge {node}→{nbr}: '{nbr}' already on the stack — ignore."
+                    if nbrs[k] in frontier else
+                    f"Edge {node}→{nbr}: '{nbr}' already visited — ignore."
+                )
+            else:
+                sb.explanation = f"Edge {node}→{nbr}: '{nbr}' unseen — push onto stack."
 
-            sb_e = StepBuilder()
-            sb_e.visited_set     = list(visited)
-            sb_e.set_current(node)
-            sb_e.set_frontier([n for n in stack if n not in visited])
-            sb_e.relax_edge(edge.id)
-            sb_e.pseudocode_line = 9
+        # -- push --
+        else:
+            j   = nbrs[k]
+            nbr = ids[j]
+            stack.append(j)
+            if frontier.pop(j, 0) is None:   # re-pushed: its top copy moves up
+                d.discard(nbr, "frontier")
+            frontier[j] = None
+            d.push(nbr, "stack", "frontier")
+            d.paint(nbr, "frontier")
+            if not full:
+                depth[j] = depth[u] + 1      # the top copy is the one visited
+                batch.append((edge_ids[k], node, nbr, float(depth[j])))
+                if expanding:
+                    sb.edge_states[edge_ids[k]] = "relaxed"
+                    sb.node_states[nbr] = "frontier"
+                continue
+            sb.reset()
+            sb.set_current(node)
+            sb.node_states[nbr] = "frontier"
+            sb.pseudocode_line = 12
+            sb.explanation     = f"Push '{nbr}' onto stack (parent = '{node}')."
 
-            if nbr in visited:
-                sb_e.edge_states[edge.id] = "ignored"
-                sb_e.explanation = f"Edge {node}→{nbr}: '{nbr}' already visited — ignore."
-            else:
-                sb_e.explanation = f"Edge {node}→{nbr}: '{nbr}' unseen — push onto stack."
-            sb_e.overlay["stack"] = list(stack)
-            yield sb_e.build(step_number=step_no)
-            step_no += 1
+        d.stamp(sb, step_no)
+        yield sb.build(step_number=step_no)
+        step_no += 1
 
-            if nbr not in visited:
-                if nbr not in parent:
-                    parent[nbr] = node
-                stack.append(nbr)
-
-                sb_p = StepBuilder()
-                sb_p.visited_set     = list(visited)
-                sb_p.set_current(node)
-                sb_p.set_frontier([n for n in stack if n not in visited])
-                sb_p.node_states[nbr] = "frontier"
-                sb_p.pseudocode_line = 12
-                sb_p.explanation     = f"Push '{nbr}' onto stack (parent = '{node}')."
-                sb_p.overlay["stack"] = list(stack)
-                yield sb_p.build(step_number=step_no)
-                step_no += 1
+    if expanding:
+        _round_step(sb, expanding, batch)
+        batch = []
+        d.stamp(sb, step_no)
+        yield sb.build(step_number=step_no)
+        step_no += 1
 
     # --- not found ---
-    sb_fin = StepBuilder()
-    sb_fin.visited_set     = list(visited)
-    sb_fin.pseudocode_line = 13
-    sb_fin.explanation     = f"Stack empty. '{target}' not reachable from '{source}'."
-    sb_fin.overlay["stack"] = []
-    yield sb_fin.build(step_number=step_no, is_final=True)
+    sb.reset()
+    sb.visited_set     = list(d.visited)
+    sb.pseudocode_line = 13
+    sb.explanation     = f"Stack empty. '{target}' not reachable from '{source}'."
+    sb.overlay["stack"] = []
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
+    yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path, cur = [], target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+def _round_step(sb: StepBuilder, node: str, batch: List[Tuple[str, str, str, float]]) -> None:
+    """Finish the condensed detail="round" Step for one visited node."""
+    sb.pseudocode_line = 9
+    sb.explanation     = (
+        f"Visit '{node}': {len(sb.edge_states)} neighbour(s) examined, "
+        f"{len(batch)} pushed onto the stack."
+    )
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
@@ -1,29 +1,47 @@
 """
 dijkstra.py — Dijkstra's Shortest-Path Algorithm
 ==================================================
-Generator-based Dijkstra using a min-heap (heapq).
+Generator-based Dijkstra using an indexed 4-ary min-heap (heap4.Heap4)
+with decrease-key, so every node sits in the queue at most once.
 
 Yields a Step at:
   1. Initialise distances / push source
   2. Pop minimum-distance node  →  CURRENT
   3. Each neighbour relaxation attempt  →  edge RELAXED or IGNORED
-  4. Successful relaxation  →  update distance, enqueue
+  4. Successful relaxation  →  update distance, enqueue / decrease-key
   5. Target popped  →  path found, reconstruct
   6. Heap empty  →  NOT REACHABLE
 
 Overlay exposes:
-  • "queue"  – [(node_id, dist)] priority queue snapshot
-  • "distances" – full current distance map
+  • "queue"  – [(dist, node_id)] priority queue snapshot
+  • "distances" – full current distance map (keyframes only)
+
+Steps are delta-encoded (see algorithms.step.StepDeltas): each carries
+only the distance / visited / frontier changes it made, plus a periodic
+keyframe with the full maps, so a step no longer copies `dist` twice.
+Use `algorithms.step.materialize` for a flat view.
+
+`detail` trades animation granularity for speed; the search is the same
+at every level, only the Steps it yields change:
+  • "full"  – one Step per event above (default).
+  • "round" – one Step per popped node; its successful relaxations are
+              listed in `batched_relaxations` as (edge_id, node, neighbour,
+              new_dist), edges to finalised nodes are only coloured.
+  • "final" – only the init and final Steps; the final one carries every
+              relaxation of the run.
+Same distances, parents and final path at every level.
 
 Correctness note: Dijkstra requires non-negative weights.
 The caller (or the UI) should warn / block if negative edges exist.
 """
 
-import heapq
-from typing import Generator, Optional, List, Dict
+from array import array
+from typing import Generator, Optional, List, Dict, Tuple
 
 from graph import Graph
-from algorithms.step import Step, StepBuilder
+from algorithms.step import Step, StepBuilder, StepDeltas
+from algorithms.heap4 import Heap4
+from algorithms._kernels import reconstruct_path
 
 
 # ---------------------------------------------------------------------------
@@ -37,14 +55,14 @@ PSEUDOCODE: List[str] = [
     "    parent ← {}",                             # 4
     "    while pq is not empty:",                   # 5
     "        (d, node) ← pq.pop_min()",            # 6
-    "        if d > dist[node]: continue",         # 7
+    "        finalise node",                       # 7
     "        if node == target: return path",      # 8
     "        for (neighbour, w) in adj(node):",    # 9
     "            new_dist ← dist[node] + w",       # 10
     "            if new_dist < dist[neighbour]:",  # 11
     "                dist[neighbour] ← new_dist",  # 12
     "                parent[neighbour] = node",    # 13
-    "                pq.push((new_dist, nbr))",    # 14
+    "                pq.push_or_decrease(nbr)",    # 14
     "    return NOT FOUND",                        # 15
 ]
 
@@ -56,160 +74,220 @@ def dijkstra(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
+    """
+    `detail` is "full" (one Step per event), "round" (one per popped node)
+    or "final" (init + final only) — see module docstring.
+    """
 
     INF     = float("inf")
     step_no = 0
 
+    ids, index, indptr, nbrs, w, edge_ids, blocked = graph.as_csr(source)
+    s, t = index[source], index.get(target, -1)     # -1: target not in graph
+    V    = len(ids)
+
     # initialise
-    dist:   Dict[str, float]            = {nid: INF for nid in graph.nodes}
-    parent: Dict[str, Optional[str]]    = {}
-    dist[source] = 0.0
-    pq = [(0.0, source)]                # min-heap: (distance, node_id)
-    visited: set = set()
+    dist:   array       = array("d", [INF]) * V
+    parent: List[int]   = [-1] * V
+    via:    List[int]   = [-1] * V      # arc slot that last improved each node
+    dist[s] = 0.0
+    visited = bytearray(V)              # 1 = finalised
+
+    # heap items stay string ids, so the queue overlay is a plain copy of
+    # the heap (equal distances pop in unspecified order, see heap4)
+    pq = Heap4()                        # indexed: one slot per node, decrease-key in place
+    pq.push(source, 0.0)
+
+    # frontier = unvisited nodes with a heap entry, each once, in order of
+    # first push (dict = insertion-ordered set)
+    frontier: Dict[int, None] = {s: None}
+
+    # distances / visited / frontier (and its sticky colour) go out as
+    # per-step deltas; keyframes also fill overlay["distances"]
+    d = StepDeltas()
+    d.track("frontier", lambda: [ids[i] for i in frontier])
+    d.track_distances(lambda: dict(zip(ids, dist)))
+    d.paint(source, "frontier")
 
     # --- init step ---
     sb = StepBuilder()
     sb.set_current(source)
-    sb.distances        = dict(dist)
     sb.pseudocode_line  = 2
     sb.explanation      = (
         f"Initialise: all distances = ∞ except source '{source}' = 0. "
         f"Push source into the priority queue."
     )
-    sb.overlay["queue"]     = [(d, n) for d, n in pq]
-    sb.overlay["distances"] = dict(dist)
+    # the queue overlay lists the heap's (dist, node_id) pairs; Steps are
+    # immutable, so one list is shared by every Step until the heap
+    # changes (None = stale)
+    queue_snap: Optional[List] = pq.items()
+    sb.overlay["queue"] = queue_snap
+    d.stamp(sb, step_no)
     yield sb.build(step_number=step_no)
     step_no += 1
 
+    # coarser detail levels fold events into the next emitted Step: the
+    # StepDeltas above simply accumulate until then, relaxations go to `batch`
+    full  = detail == "full"
+    batch: List[Tuple[str, str, str, float]] = []
+
     # --- main loop ---
     while pq:
-        d, node = heapq.heappop(pq)
-
-        # stale entry
-        if d > dist[node]:
-            sb_stale = StepBuilder()
-            sb_stale.visited_set     = list(visited)
-            sb_stale.distances       = dict(dist)
-            sb_stale.pseudocode_line = 7
-            sb_stale.explanation     = (
-                f"Pop (dist={d}, '{node}') — stale entry (current best = {dist[node]}). Skip."
+        dd, node = pq.pop_min()            # never stale: no duplicates in an indexed heap
+        u = index[node]
+        queue_snap = pq.items() if full else None   # every pop is shown
+
+        visited[u] = 1
+        del frontier[u]
+        d.add_visited(node)
+        d.discard(node, "frontier")
+        d.paint(node, None)
+
+        # -- pop event --  (folded into the expansion step at coarser detail)
+        sb.reset()
+        sb.set_current(node)
+        sb.visit(node)
+        sb.metrics["nodes_visited"] = len(d.visited)
+        if full:
+            sb.pseudocode_line = 6
+            sb.explanation     = (
+                f"Pop '{node}' with distance {dd} — smallest in the priority queue. "
+                f"This distance is now FINAL (Dijkstra guarantee)."
             )
-            sb_stale.overlay["queue"]     = [(dd, n) for dd, n in pq]
-            sb_stale.overlay["distances"] = dict(dist)
-            yield sb_stale.build(step_number=step_no)
+            sb.overlay["queue"] = queue_snap
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
-            continue
-
-        visited.add(node)
-
-        # -- pop event --
-        sb2 = StepBuilder()
-        sb2.visited_set     = list(visited)
-        sb2.set_current(node)
-        sb2.visit(node)
-        sb2.set_frontier([n for _, n in pq if n not in visited])
-        sb2.distances       = dict(dist)
-        sb2.pseudocode_line = 6
-        sb2.explanation     = (
-            f"Pop '{node}' with distance {d} — smallest in the priority queue. "
-            f"This distance is now FINAL (Dijkstra guarantee)."
-        )
-        sb2.overlay["queue"]     = [(dd, n) for dd, n in pq]
-        sb2.overlay["distances"] = dict(dist)
-        yield sb2.build(step_number=step_no)
-        step_no += 1
 
         # -- target check --
-        if node == target:
-            path = _reconstruct(parent, target)
-            sb3 = StepBuilder()
-            sb3.visited_set     = list(visited)
-            sb3.distances       = dict(dist)
-            sb3.pseudocode_line = 8
-            sb3.set_path(path)
-            sb3.explanation     = (
-                f"🎯 Target '{target}' popped! Shortest distance = {dist[target]}. "
+        if u == t:
+            path, path_edges = reconstruct_path(ids, edge_ids, parent, via, t)
+            sb.reset()
+            sb.pseudocode_line = 8
+            sb.set_path(path)
+            sb.explanation     = (
+                f"🎯 Target '{target}' popped! Shortest distance = {dist[t]}. "
                 f"Path: {' → '.join(path)}"
             )
-            for i in range(len(path) - 1):
-                e = graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    sb3.choose_edge(e.id)
-            sb3.overlay["queue"]     = [(dd, n) for dd, n in pq]
-            sb3.overlay["distances"] = dict(dist)
-            yield sb3.build(step_number=step_no, is_final=True)
+            for eid in path_edges:
+                sb.choose_edge(eid)
+            if queue_snap is None:
+                queue_snap = pq.items()
+            sb.overlay["queue"] = queue_snap
+            for eid, a, b, nd in batch:
+                sb.add_batched_relaxation(eid, a, b, nd)
+            d.stamp(sb, step_no, full=True)
+            yield sb.build(step_number=step_no, is_final=True)
             return
 
         # -- relax neighbours --
-        for nbr, edge in graph.neighbours(node):
-            nbr_node = graph.get_node(nbr)
-            if nbr_node and nbr_node.blocked:
+        improved = 0                       # detail="round": relaxations into this Step
+        for k in range(indptr[u], indptr[u + 1]):
+            j = nbrs[k]
+            if blocked[j]:
                 continue
-            if nbr in visited:
+            nbr, eid, wk = ids[j], edge_ids[k], w[k]
+            if visited[j]:
                 # already finalised — show as ignored
-                sb_ig = StepBuilder()
-                sb_ig.visited_set     = list(visited)
-                sb_ig.set_current(node)
-                sb_ig.distances       = dict(dist)
-                sb_ig.edge_states[edge.id] = "ignored"
-                sb_ig.pseudocode_line = 9
-                sb_ig.explanation     = f"Edge {node}→{nbr} (w={edge.weight}): '{nbr}' already finalised — skip."
-                sb_ig.overlay["queue"]     = [(dd, n) for dd, n in pq]
-                sb_ig.overlay["distances"] = dict(dist)
-                yield sb_ig.build(step_number=step_no)
+                if not full:
+                    if detail == "round":
+                        sb.edge_states[eid] = "ignored"
+                    continue
+                sb.reset()
+                sb.set_current(node)
+                sb.edge_states[eid] = "ignored"
+                sb.pseudocode_line = 9
+                sb.explanation     = f"Edge {node}→{nbr} (w={wk}): '{nbr}' already finalised — skip."
+                if queue_snap is None:
+                    queue_snap = pq.items()
+                sb.overlay["queue"] = queue_snap
+                d.stamp(sb, step_no)
+                yield sb.build(step_number=step_no)
                 step_no += 1
                 continue
 
-            new_dist = dist[node] + edge.weight
+            new_dist = dd + wk
+
+            if not full:
+                if new_dist < dist[j]:
+                    d.set_distance(nbr, dist[j], new_dist)
+                    dist[j]   = new_dist
+                    parent[j] = u
+                    via[j]    = k
+                    if j in frontier:
+                        pq.decrease_key(nbr, new_dist)
+                    else:
+                        pq.push(nbr, new_dist)
+                        frontier[j] = None
+                        d.push(nbr, "frontier")
+                        d.paint(nbr, "frontier")
+                    batch.append((eid, node, nbr, new_dist))
+                    if detail == "round":
+                        improved += 1
+                        sb.edge_states[eid] = "relaxed"
+                        sb.node_states[nbr] = "frontier"
+                elif detail == "round":
+                    sb.edge_states[eid] = "ignored"
+                continue
 
             # -- relaxation attempt step --
-            sb_r = StepBuilder()
-            sb_r.visited_set     = list(visited)
-            sb_r.set_current(node)
-            sb_r.set_frontier([n for _, n in pq if n not in visited])
-            sb_r.relax_edge(edge.id)
-            sb_r.distances       = dict(dist)
-            sb_r.pseudocode_line = 10
-
-            if new_dist < dist[nbr]:
-                sb_r.explanation = (
-                    f"Relax {node}→{nbr}: {dist[node]} + {edge.weight} = {new_dist} "
-                    f"< current {dist[nbr]} → UPDATE!"
+            sb.reset_edge_event(node, eid, 10)
+
+            if new_dist < dist[j]:
+                sb.explanation = (
+                    f"Relax {node}→{nbr}: {dd} + {wk} = {new_dist} "
+                    f"< current {dist[j]} → UPDATE!"
                 )
-                dist[nbr]   = new_dist
-                parent[nbr] = node
-                heapq.heappush(pq, (new_dist, nbr))
-                sb_r.distances = dict(dist)
-                sb_r.node_states[nbr] = "frontier"
+                d.set_distance(nbr, dist[j], new_dist)
+                dist[j]    = new_dist
+                parent[j]  = u
+                via[j]     = k
+                queue_snap = None
+                if j in frontier:
+                    pq.decrease_key(nbr, new_dist)
+                else:
+                    pq.push(nbr, new_dist)
+                    frontier[j] = None
+                    d.push(nbr, "frontier")
+                    d.paint(nbr, "frontier")
+                sb.node_states[nbr] = "frontier"
             else:
-                sb_r.explanation = (
-                    f"Edge {node}→{nbr}: {dist[node]} + {edge.weight} = {new_dist} "
-                    f"≥ current {dist[nbr]} → no improvement."
+                sb.explanation = (
+                    f"Edge {node}→{nbr}: {dd} + {wk} = {new_dist} "
+                    f"≥ current {dist[j]} → no improvement."
                 )
-                sb_r.edge_states[edge.id] = "ignored"
+                sb.edge_states[eid] = "ignored"
 
-            sb_r.overlay["queue"]     = [(dd, n) for dd, n in pq]
-            sb_r.overlay["distances"] = dict(dist)
-            yield sb_r.build(step_number=step_no)
+            if queue_snap is None:
+                queue_snap = pq.items()
+            sb.overlay["queue"] = queue_snap
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
 
-    # --- not found ---
-    sb_fin = StepBuilder()
-    sb_fin.visited_set     = list(visited)
-    sb_fin.distances       = dict(dist)
-    sb_fin.pseudocode_line = 15
-    sb_fin.explanation     = f"Priority queue empty. '{target}' is not reachable."
-    sb_fin.overlay["queue"]     = []
-    sb_fin.overlay["distances"] = dict(dist)
-    yield sb_fin.build(step_number=step_no, is_final=True)
-
+        # -- one condensed step per popped node --
+        if detail == "round":
+            sb.pseudocode_line = 9
+            sb.explanation     = (
+                f"Pop '{node}' with final distance {dd}: "
+                f"{len(sb.edge_states)} neighbour(s) examined, {improved} improved."
+            )
+            for eid, a, b, nd in batch:
+                sb.add_batched_relaxation(eid, a, b, nd)
+            batch = []
+            sb.overlay["queue"] = pq.items()
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
+            step_no += 1
 
-# ---------------------------------------------------------------------------
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path, cur = [], target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+    # --- not found ---
+    sb.reset()
+    sb.pseudocode_line = 15
+    sb.explanation     = f"Priority queue empty. '{target}' is not reachable."
+    sb.overlay["queue"] = []
+    for eid, a, b, nd in batch:
+        sb.add_batched_relaxation(eid, a, b, nd)
+    d.stamp(sb, step_no, full=True)
+    yield sb.build(step_number=step_no, is_final=True)
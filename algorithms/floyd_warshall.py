@@ -2,8 +2,11 @@
 floyd_warshall.py — Floyd–Warshall (All-Pairs Shortest Paths)
 ===============================================================
 The signature "matrix algorithm".  The overlay exposes the full NxN
-distance matrix at every step so the UI can render it as a live grid —
-the single most important visual for understanding Floyd-Warshall.
+distance matrix so the UI can render it as a live grid — the single most
+important visual for understanding Floyd-Warshall.  Per-update steps
+carry only the cell they changed ("matrix_deltas") and point `keyframe`
+at their round's start step; `algorithms.step.materialize` rebuilds the
+full matrix, so a step costs O(1) instead of an O(n²) snapshot.
 
 Structure:
   for k in nodes:          ← "intermediate" node
@@ -18,15 +21,26 @@ Yields a Step for:
   3. End of each k-round (summary)
   4. Final: extract path for the user's chosen source→target pair
 
-Because Floyd-Warshall is O(V³) and generates a LOT of steps, we
-offer a "condensed" mode that only yields on actual updates + round
-boundaries, keeping the step count manageable for the UI.
+Because Floyd-Warshall is O(V³) and generates a LOT of steps, only
+actual updates get a Step, and `detail` trims further:
+  • "full"  – everything above (default).
+  • "round" – no round-start or per-update steps (2): each k-round runs
+              through the silent `_kernels.fw_round_kernel` and only its
+              summary step (3) is yielded.  V + 2 steps.
+  • "final" – only the init and final steps.  On a sparse graph with no
+              negative weight (arcs · log₂ V < V²) the rounds are replaced
+              by one Dijkstra per source (`_kernels.apsp_dijkstra_kernel`),
+              O(V·E log V) instead of O(V³).
+Same matrices and final path at every level — except that when two
+routes tie, the Dijkstra shortcut of "final" may pick the other one.
 """
 
-from typing import Generator, List, Dict, Optional
+import math
+from typing import Generator, List, Dict, Optional, Tuple
 
 from graph import Graph
 from algorithms.step import Step, StepBuilder
+from algorithms._kernels import apsp_dijkstra_kernel, fw_round_kernel
 
 
 # ---------------------------------------------------------------------------
@@ -54,10 +68,14 @@ def floyd_warshall(
     graph: Graph,
     source: str,
     target: str,
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
     """
     source / target are only used at the END to extract the specific
     path the user cares about.  The algorithm itself computes ALL pairs.
+
+    `detail` is "full" (a Step per update), "round" (one per k) or
+    "final" (init + final only) — see module docstring.
     """
 
     INF     = float("inf")
@@ -76,24 +94,26 @@ def floyd_warshall(
         dist[i][i] = 0
         nxt[i][i]  = i
 
-    for edge in graph.edges.values():
-        u = idx.get(edge.source)
-        v = idx.get(edge.target)
-        if u is None or v is None:
-            continue
-        # skip blocked
-        u_node = graph.get_node(edge.source)
-        v_node = graph.get_node(edge.target)
-        if (u_node and u_node.blocked) or (v_node and v_node.blocked):
-            continue
-
-        if edge.weight < dist[u][v]:
-            dist[u][v] = edge.weight
+    # every traversable arc (undirected edges give both directions) from
+    # the graph's SoA view; `pos` maps its insertion-order idx onto the
+    # sorted matrix order.  `arc_edge` names the edge behind dist[u][v]:
+    # the cheapest parallel arc (first on ties), so the path steps mark
+    # the edges whose weights the reported cost adds up.  A blocked arc is
+    # only a fallback, kept for highlighting
+    soa = graph.as_soa()
+    pos = [idx[nid] for nid in soa.ids]
+    arc_edge: Dict[Tuple[int, int], str] = {}
+    adj: List[List[Tuple[int, float]]] = [[] for _ in range(n)]   # unblocked arcs, matrix idx
+    for a, b, wk, eid in zip(soa.src, soa.tgt, soa.w, soa.edge_ids):
+        u, v = pos[a], pos[b]
+        if soa.blocked[a] or soa.blocked[b]:
+            arc_edge.setdefault((u, v), eid)
+            continue                  # skip blocked
+        adj[u].append((v, wk))
+        if wk < dist[u][v]:
+            dist[u][v] = wk
             nxt[u][v]  = v
-        if not edge.directed:
-            if edge.weight < dist[v][u]:
-                dist[v][u] = edge.weight
-                nxt[v][u]  = u
+            arc_edge[(u, v)] = eid
 
     # -- init step --
     sb = StepBuilder()
@@ -111,76 +131,90 @@ def floyd_warshall(
     # ==============================================================
     # MAIN TRIPLE LOOP
     # ==============================================================
-    for k in range(n):
-        updates_this_round = 0
-
-        # -- k-round start --
-        sb_ks = StepBuilder()
-        sb_ks.pseudocode_line = 3
-        sb_ks.set_current(nodes[k])
-        sb_ks.explanation = (
-            f"── k = {nodes[k]} ── Allow paths through '{nodes[k]}' as intermediate."
-        )
-        sb_ks.overlay["matrix"] = _matrix_snapshot(dist, nodes)
-        sb_ks.overlay["k"]      = nodes[k]
-        sb_ks.overlay["nodes"]  = nodes
-        yield sb_ks.build(step_number=step_no)
-        step_no += 1
+    # "final" shows no round, so on a sparse graph without negative weights
+    # n Dijkstras reach the same matrix sooner than n rounds of O(n²)
+    rounds = range(n)
+    if detail == "final" and _dijkstra_pays(adj, n):
+        apsp_dijkstra_kernel(dist, nxt, adj)
+        rounds = range(0)
+
+    for k in rounds:
+        if detail != "full":
+            updates_this_round = fw_round_kernel(dist, nxt, k)  # silent kernel
+            if detail == "final":
+                continue
+        else:
+            updates_this_round = 0
+
+            # -- k-round start --  (full matrix: keyframe for the round's updates)
+            round_key = step_no
+            sb.reset()
+            sb.pseudocode_line = 3
+            sb.set_current(nodes[k])
+            sb.explanation = (
+                f"── k = {nodes[k]} ── Allow paths through '{nodes[k]}' as intermediate."
+            )
+            sb.overlay["matrix"] = _matrix_snapshot(dist, nodes)
+            sb.overlay["k"]      = nodes[k]
+            sb.overlay["nodes"]  = nodes
+            yield sb.build(step_number=step_no)
+            step_no += 1
+
+            for i in range(n):
+                if dist[i][k] == INF:
+                    continue          # optimisation: skip entire row
+                for j in range(n):
+                    if i == j:
+                        continue
+                    if dist[k][j] == INF:
+                        continue
 
-        for i in range(n):
-            if dist[i][k] == INF:
-                continue          # optimisation: skip entire row
-            for j in range(n):
-                if i == j:
-                    continue
-                if dist[k][j] == INF:
-                    continue
-
-                new_dist = dist[i][k] + dist[k][j]
-
-                if new_dist < dist[i][j]:
-                    old_dist    = dist[i][j]
-                    dist[i][j]  = new_dist
-                    nxt[i][j]   = nxt[i][k]
-                    updates_this_round += 1
-
-                    # -- relaxation step (only on actual updates) --
-                    sb_r = StepBuilder()
-                    sb_r.set_current(nodes[k])
-                    sb_r.pseudocode_line = 8
-                    sb_r.explanation = (
-                        f"Update dist[{nodes[i]}][{nodes[j]}]: "
-                        f"via {nodes[k]}: {dist[i][k]} + {dist[k][j]} = {new_dist} "
-                        f"< {old_dist if old_dist != INF else '∞'}"
-                    )
-                    # highlight the two nodes involved
-                    sb_r.node_states[nodes[i]] = "frontier"
-                    sb_r.node_states[nodes[j]] = "frontier"
-                    sb_r.node_states[nodes[k]] = "current"
-                    # highlight edges i→k and k→j if they exist
-                    e1 = graph.get_edge_between(nodes[i], nodes[k])
-                    e2 = graph.get_edge_between(nodes[k], nodes[j])
-                    if e1:
-                        sb_r.relax_edge(e1.id)
-                    if e2:
-                        sb_r.relax_edge(e2.id)
-                    sb_r.overlay["matrix"]       = _matrix_snapshot(dist, nodes)
-                    sb_r.overlay["k"]            = nodes[k]
-                    sb_r.overlay["nodes"]        = nodes
-                    sb_r.overlay["highlight_cell"] = (nodes[i], nodes[j])
-                    yield sb_r.build(step_number=step_no)
-                    step_no += 1
+                    new_dist = dist[i][k] + dist[k][j]
+
+                    if new_dist < dist[i][j]:
+                        old_dist    = dist[i][j]
+                        dist[i][j]  = new_dist
+                        nxt[i][j]   = nxt[i][k]
+                        updates_this_round += 1
+
+                        # -- relaxation step (only on actual updates) --
+                        sb.reset()
+                        sb.set_current(nodes[k])
+                        sb.pseudocode_line = 8
+                        sb.explanation = (
+                            f"Update dist[{nodes[i]}][{nodes[j]}]: "
+                            f"via {nodes[k]}: {dist[i][k]} + {dist[k][j]} = {new_dist} "
+                            f"< {old_dist if old_dist != INF else '∞'}"
+                        )
+                        # highlight the two nodes involved
+                        sb.node_states[nodes[i]] = "frontier"
+                        sb.node_states[nodes[j]] = "frontier"
+                        sb.node_states[nodes[k]] = "current"
+                        # highlight edges i→k and k→j if they exist
+                        e1 = arc_edge.get((i, k))
+                        e2 = arc_edge.get((k, j))
+                        if e1:
+                            sb.relax_edge(e1)
+                        if e2:
+                            sb.relax_edge(e2)
+                        sb.keyframe = round_key    # no full matrix — this cell only
+                        sb.overlay["matrix_deltas"]  = [(i, j, new_dist)]
+                        sb.overlay["k"]              = nodes[k]
+                        sb.overlay["nodes"]          = nodes
+                        sb.overlay["highlight_cell"] = (nodes[i], nodes[j])
+                        yield sb.build(step_number=step_no)
+                        step_no += 1
 
         # -- k-round end --
-        sb_ke = StepBuilder()
-        sb_ke.pseudocode_line = 3
-        sb_ke.explanation = (
+        sb.reset()
+        sb.pseudocode_line = 3
+        sb.explanation = (
             f"Round k={nodes[k]} complete: {updates_this_round} update(s)."
         )
-        sb_ke.overlay["matrix"] = _matrix_snapshot(dist, nodes)
-        sb_ke.overlay["k"]      = nodes[k]
-        sb_ke.overlay["nodes"]  = nodes
-        yield sb_ke.build(step_number=step_no)
+        sb.overlay["matrix"] = _matrix_snapshot(dist, nodes)
+        sb.overlay["k"]      = nodes[k]
+        sb.overlay["nodes"]  = nodes
+        yield sb.build(step_number=step_no)
         step_no += 1
 
     # ==============================================================
@@ -190,31 +224,31 @@ def floyd_warshall(
     ti = idx.get(target)
 
     if si is None or ti is None or dist[si][ti] == INF:
-        sb_nf = StepBuilder()
-        sb_nf.pseudocode_line = 10
-        sb_nf.explanation     = f"All pairs computed. '{target}' not reachable from '{source}'."
-        sb_nf.overlay["matrix"] = _matrix_snapshot(dist, nodes)
-        sb_nf.overlay["nodes"]  = nodes
-        yield sb_nf.build(step_number=step_no, is_final=True)
+        sb.reset()
+        sb.pseudocode_line = 10
+        sb.explanation     = f"All pairs computed. '{target}' not reachable from '{source}'."
+        sb.overlay["matrix"] = _matrix_snapshot(dist, nodes)
+        sb.overlay["nodes"]  = nodes
+        yield sb.build(step_number=step_no, is_final=True)
         return
 
     # reconstruct via next-hop matrix
     path = _reconstruct_path(nxt, si, ti, nodes)
 
-    sb_fin = StepBuilder()
-    sb_fin.pseudocode_line = 10
-    sb_fin.set_path(path)
-    sb_fin.explanation = (
+    sb.reset()
+    sb.pseudocode_line = 10
+    sb.set_path(path)
+    sb.explanation = (
         f"✅ All-pairs done. Shortest {source}→{target}: "
         f"{' → '.join(path)}, cost = {dist[si][ti]}."
     )
     for i in range(len(path) - 1):
-        e = graph.get_edge_between(path[i], path[i + 1])
+        e = arc_edge.get((idx[path[i]], idx[path[i + 1]]))
         if e:
-            sb_fin.choose_edge(e.id)
-    sb_fin.overlay["matrix"] = _matrix_snapshot(dist, nodes)
-    sb_fin.overlay["nodes"]  = nodes
-    yield sb_fin.build(step_number=step_no, is_final=True)
+            sb.choose_edge(e)
+    sb.overlay["matrix"] = _matrix_snapshot(dist, nodes)
+    sb.overlay["nodes"]  = nodes
+    yield sb.build(step_number=step_no, is_final=True)
 
 
 # ---------------------------------------------------------------------------
@@ -231,6 +265,14 @@ def _matrix_snapshot(dist: List[List[float]], nodes: List[str]) -> List[Dict]:
     return rows
 
 
+def _dijkstra_pays(adj: List[List[Tuple[int, float]]], n: int) -> bool:
+    """Sparse (arcs · log₂ n < n²) and no negative weight: n Dijkstras beat FW."""
+    arcs = sum(map(len, adj))
+    if n < 2 or arcs * math.log2(n) >= n * n:
+        return False
+    return all(wk >= 0 for out in adj for _, wk in out)
+
+
 def _reconstruct_path(
     nxt: List[List[Optional[int]]],
     si: int,
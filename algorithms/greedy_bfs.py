@@ -13,14 +13,31 @@ Shares the same heuristic catalogue as A* (manhattan / euclidean / …).
 Overlay:
   • "queue"  – [(h, node_id)] priority queue
   • "scores" – [{node, h, note}]  (note flags suboptimality)
+
+Steps are delta-encoded (see algorithms.step.StepDeltas): visited set,
+frontier and their sticky colours go out as changes plus a periodic
+keyframe; use `algorithms.step.materialize` for a flat view.
+
+`detail` levels (see `algorithms.dijkstra`):
+  • "full"  – one Step per pop and per push (default).
+  • "round" – one Step per popped node; its pushes are listed in
+              `batched_relaxations` as (edge_id, node, neighbour, h).
+  • "final" – only the init and final Steps; the final one carries every
+              push of the run.
+
+The open set holds (h, node idx) pairs, so nodes with equal h are
+expanded in graph insertion order, not in node-id order as when it held
+id strings.  On ties (e.g. a zero heuristic) the expansion order can
+therefore differ from older versions.
 """
 
 import heapq, math
-from typing import Generator, Optional, List, Dict, Callable
+from typing import Generator, List, Dict, Callable, Tuple
 
 from graph import Graph, Node
-from algorithms.step import Step, StepBuilder
-from algorithms.astar import HEURISTICS, euclidean
+from algorithms.step import Step, StepBuilder, StepDeltas
+from algorithms.astar import heuristic_table
+from algorithms._kernels import reconstruct_path
 
 
 # ---------------------------------------------------------------------------
@@ -52,24 +69,38 @@ def greedy_bfs(
     source: str,
     target: str,
     heuristic: str = "euclidean",
+    detail: str = "full",
 ) -> Generator[Step, None, None]:
+    """
+    `detail` is "full" (one Step per pop and push), "round" (one per popped
+    node) or "final" (init + final only) — see module docstring.
+    """
+
+    ids, index, indptr, nbrs, w, edge_ids, blocked = graph.as_csr(source)
+    s, t = index[source], index.get(target, -1)     # -1: target not in graph
+    V    = len(ids)
 
-    h_fn      = HEURISTICS.get(heuristic, euclidean)
-    tgt_node  = graph.get_node(target)
-    src_node  = graph.get_node(source)
+    # the target is fixed, so h is tabulated for every node once up front
+    # (shared with A*); a source absent from the graph gets h = 0
+    h_tab = heuristic_table(graph, target, heuristic)
+    h_tab += [0.0] * (V - len(h_tab))
 
     step_no   = 0
-    visited:  set                        = set()
-    parent:   Dict[str, Optional[str]]   = {source: None}
-    h_cache:  Dict[str, float]           = {}
+    visited                           = bytearray(V)   # 1 = popped
+    score_rows: List[Dict]            = []     # "scores" overlay rows, in visiting order
+    parent:   List[int]               = [-1] * V
+    via:      List[int]               = [-1] * V     # arc slot that reached each node
 
-    def _h(nid: str) -> float:
-        if nid not in h_cache:
-            n = graph.get_node(nid)
-            h_cache[nid] = h_fn(n, tgt_node) if n and tgt_node else 0.0
-        return h_cache[nid]
+    open_set = [(h_tab[s], s)]             # (h, idx): equal h breaks by insertion order
 
-    open_set = [(_h(source), source)]
+    # frontier = unvisited nodes with an open_set entry, each once, in order
+    # of first push — kept as we go instead of re-filtering the heap
+    frontier: Dict[int, None] = {s: None}
+
+    # visited / frontier (and its sticky colour) go out as per-step deltas
+    d = StepDeltas()
+    d.track("frontier", lambda: [ids[i] for i in frontier])
+    d.paint(source, "frontier")
 
     # -- init --
     sb = StepBuilder()
@@ -77,97 +108,133 @@ def greedy_bfs(
     sb.pseudocode_line = 1
     sb.explanation = (
         f"Greedy Best-First: only h matters — no g cost at all! "
-        f"h('{source}') = {_h(source):.2f} using {heuristic}."
+        f"h('{source}') = {h_tab[s]:.2f} using {heuristic}."
     )
-    sb.overlay["queue"]  = [(h, n) for h, n in open_set]
-    sb.overlay["scores"] = [{"node": source, "h": _h(source)}]
+    sb.overlay["queue"]  = [(h, ids[i]) for h, i in open_set]
+    sb.overlay["scores"] = [{"node": source, "h": h_tab[s]}]
+    d.stamp(sb, step_no)
     yield sb.build(step_number=step_no)
     step_no += 1
 
+    # coarser detail levels fold the pop and its pushes into one Step (or
+    # none); pushes not yet shown go to `batch`
+    full  = detail == "full"
+    batch: List[Tuple[str, str, str, float]] = []
+
     # --- main loop ---
     while open_set:
-        _, node = heapq.heappop(open_set)
+        _, u = heapq.heappop(open_set)
 
-        if node in visited:
+        if visited[u]:
             continue
 
-        visited.add(node)
-
-        # -- pop event --
-        sb2 = StepBuilder()
-        sb2.visited_set     = list(visited)
-        sb2.set_current(node)
-        sb2.visit(node)
-        sb2.set_frontier([n for _, n in open_set if n not in visited])
-        sb2.pseudocode_line = 7
-        sb2.explanation     = (
-            f"Pop '{node}' (h={_h(node):.2f}). "
-            f"⚠️ Greedy chose this purely because h is smallest — "
-            f"actual path cost is IGNORED."
-        )
-        sb2.overlay["queue"]  = [(h, n) for h, n in open_set if n not in visited]
-        sb2.overlay["scores"] = [{"node": n, "h": _h(n)} for n in visited]
-        yield sb2.build(step_number=step_no)
-        step_no += 1
+        node = ids[u]
+        visited[u] = 1
+        score_rows.append({"node": node, "h": h_tab[u]})
+        del frontier[u]
+        d.add_visited(node)
+        d.discard(node, "frontier")
+        d.paint(node, None)
+
+        # -- pop event --  (folded into the expansion step at coarser detail)
+        sb.reset()
+        sb.set_current(node)
+        if full:
+            sb.visit(node)
+            sb.metrics["nodes_visited"] = len(d.visited)
+            sb.pseudocode_line = 7
+            sb.explanation     = (
+                f"Pop '{node}' (h={h_tab[u]:.2f}). "
+                f"⚠️ Greedy chose this purely because h is smallest — "
+                f"actual path cost is IGNORED."
+            )
+            sb.overlay["queue"]  = [(h, ids[i]) for h, i in open_set if not visited[i]]
+            sb.overlay["scores"] = list(score_rows)
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
+            step_no += 1
 
         # -- target check --
-        if node == target:
-            path = _reconstruct(parent, target)
-            sb3 = StepBuilder()
-            sb3.visited_set     = list(visited)
-            sb3.pseudocode_line = 8
-            sb3.set_path(path)
-            sb3.explanation     = (
+        if u == t:
+            path, path_edges = reconstruct_path(ids, edge_ids, parent, via, t)
+            sb.reset()
+            sb.pseudocode_line = 8
+            sb.set_path(path)
+            sb.explanation     = (
                 f"🎯 Target found! Path: {' → '.join(path)} ({len(path)-1} edges). "
                 f"⚠️ Note: this path may NOT be optimal — greedy ignores edge costs."
             )
-            for i in range(len(path) - 1):
-                e = graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    sb3.choose_edge(e.id)
-            yield sb3.build(step_number=step_no, is_final=True)
+            for eid in path_edges:
+                sb.choose_edge(eid)
+            for eid, a, b, h in batch:
+                sb.add_batched_relaxation(eid, a, b, h)
+            d.stamp(sb, step_no, full=True)
+            yield sb.build(step_number=step_no, is_final=True)
             return
 
         # -- neighbours --
-        for nbr, edge in graph.neighbours(node):
-            nbr_node = graph.get_node(nbr)
-            if nbr_node and nbr_node.blocked:
+        for k in range(indptr[u], indptr[u + 1]):
+            j = nbrs[k]
+            if blocked[j]:
+                continue
+            if visited[j]:
                 continue
-            if nbr in visited:
+            nbr = ids[j]
+
+            heapq.heappush(open_set, (h_tab[j], j))
+            if j not in frontier:
+                frontier[j] = None
+                d.push(nbr, "frontier")
+                d.paint(nbr, "frontier")
+            if parent[j] == -1 and j != s:
+                parent[j] = u
+                via[j]    = k
+
+            if not full:
+                batch.append((edge_ids[k], node, nbr, h_tab[j]))
+                if detail == "round":
+                    sb.edge_states[edge_ids[k]] = "relaxed"
+                    sb.node_states[nbr] = "frontier"
                 continue
 
-            heapq.heappush(open_set, (_h(nbr), nbr))
-            if nbr not in parent:
-                parent[nbr] = node
-
-            sb_e = StepBuilder()
-            sb_e.visited_set     = list(visited)
-            sb_e.set_current(node)
-            sb_e.relax_edge(edge.id)
-            sb_e.node_states[nbr] = "frontier"
-            sb_e.pseudocode_line = 12
-            sb_e.explanation     = (
-                f"Push '{nbr}' (h={_h(nbr):.2f}). "
+            sb.reset()
+            sb.set_current(node)
+            sb.relax_edge(edge_ids[k])
+            sb.node_states[nbr] = "frontier"
+            sb.pseudocode_line = 12
+            sb.explanation     = (
+                f"Push '{nbr}' (h={h_tab[j]:.2f}). "
                 f"Greedy will pick whichever neighbour has lowest h next — "
-                f"edge weight {edge.weight} is irrelevant here."
+                f"edge weight {w[k]} is irrelevant here."
             )
-            sb_e.overlay["queue"] = [(h, n) for h, n in open_set if n not in visited]
-            yield sb_e.build(step_number=step_no)
+            sb.overlay["queue"] = [(h, ids[i]) for h, i in open_set if not visited[i]]
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
             step_no += 1
 
-    # --- not found ---
-    sb_fin = StepBuilder()
-    sb_fin.visited_set     = list(visited)
-    sb_fin.pseudocode_line = 13
-    sb_fin.explanation     = "Open set empty — target not reachable."
-    yield sb_fin.build(step_number=step_no, is_final=True)
-
+        # -- one condensed step per popped node --
+        if detail == "round":
+            sb.visit(node)
+            sb.metrics["nodes_visited"] = len(d.visited)
+            sb.pseudocode_line = 9
+            sb.explanation     = (
+                f"Pop '{node}' (h={h_tab[u]:.2f}) and push {len(batch)} unvisited "
+                f"neighbour(s) — by h alone, edge weights are irrelevant."
+            )
+            for eid, a, b, h in batch:
+                sb.add_batched_relaxation(eid, a, b, h)
+            batch = []
+            sb.overlay["queue"]  = [(h, ids[i]) for h, i in open_set if not visited[i]]
+            sb.overlay["scores"] = list(score_rows)
+            d.stamp(sb, step_no)
+            yield sb.build(step_number=step_no)
+            step_no += 1
 
-# ---------------------------------------------------------------------------
-def _reconstruct(parent: Dict[str, Optional[str]], target: str) -> List[str]:
-    path, cur = [], target
-    while cur is not None:
-        path.append(cur)
-        cur = parent.get(cur)
-    path.reverse()
-    return path
+    # --- not found ---
+    sb.reset()
+    sb.pseudocode_line = 13
+    sb.explanation     = "Open set empty — target not reachable."
+    for eid, a, b, h in batch:
+        sb.add_batched_relaxation(eid, a, b, h)
+    d.stamp(sb, step_no, full=True)
+    yield sb.build(step_number=step_no, is_final=True)
@@ -0,0 +1,170 @@
+"""
+heap4.py — Indexed 4-ary Min-Heap
+==================================
+Priority queue with decrease-key, used by the shortest-path generators in
+place of `heapq` + lazy deletion.
+
+Why not plain heapq?
+  - heapq cannot update a priority in place, so the usual trick is to push
+    a duplicate `(f, node)` and skip the stale copy when it is popped.
+    The heap then grows to O(E) entries and every stale pop is wasted work.
+  - An indexed heap keeps each node in exactly ONE slot (`pos[node]`),
+    so `decrease_key` sifts that slot up and the heap never exceeds O(V).
+
+Why 4-ary?
+  - Shallower tree (log₄ n levels) → fewer swaps on push / decrease-key,
+    which dominate in shortest-path workloads.  Children of slot i live
+    at 4i+1 … 4i+4, next to each other in the backing list.
+
+Fused pop → push:
+  - A shortest-path loop pops a node and then, usually, pushes a
+    neighbour.  pop_min() therefore leaves a "hole" at the root instead of
+    immediately moving the last slot up and sifting it down; if the next
+    operation is push(), the new item drops straight into the hole and is
+    sifted down once (heapq.heapreplace's trick) — one sift instead of
+    two.  Any other operation that needs a valid root fills the hole the
+    ordinary way first.
+
+Ordering:
+  Entries ARE `(key, item)` tuples, so items come out in non-decreasing
+  key order.  Among equal keys the order is unspecified: don't expect it
+  to reproduce the sequence of a binary heapq run (or any other queue)
+  on ties.  Storing the tuple (rather than items plus a key dict) lets a
+  sift compare entries directly and makes items() a list copy, as cheap
+  as `list(pq)` was with heapq.
+"""
+
+from typing import Dict, Generic, Hashable, List, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+_D = 4   # arity
+
+
+class Heap4(Generic[T]):
+    """
+    Attributes:
+        _heap : `(key, item)` entries in heap order.  Entries are replaced,
+                never mutated, so a copy of the list is a valid snapshot.
+        _pos  : {item: slot index in _heap}.
+        _hole : True while _heap[0] is a stale, already-popped entry.
+    """
+
+    __slots__ = ("_heap", "_pos", "_hole")
+
+    def __init__(self):
+        self._heap: List[Tuple[float, T]] = []
+        self._pos:  Dict[T, int]          = {}
+        self._hole: bool                  = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def push(self, item: T, key: float) -> None:
+        """Insert a new item.  Use decrease_key() if it is already queued."""
+        entry = (key, item)
+        if self._hole:                      # fused with the preceding pop
+            self._hole = False
+            self._heap[0]   = entry
+            self._pos[item] = 0
+            self._sift_down(0)
+            return
+        self._pos[item] = len(self._heap)
+        self._heap.append(entry)
+        self._sift_up(len(self._heap) - 1)
+
+    def pop_min(self) -> Tuple[float, T]:
+        """Remove and return the `(key, item)` pair with the smallest key."""
+        if self._hole:
+            self._fill_hole()
+        heap = self._heap
+        top  = heap[0]
+        if len(heap) == 1:
+            heap.pop()
+        else:
+            self._hole = True               # root refilled lazily (see docstring)
+        del self._pos[top[1]]
+        return top
+
+    def decrease_key(self, item: T, key: float) -> None:
+        """Lower the priority of an item that is already in the heap."""
+        if self._hole:
+            self._fill_hole()
+        i = self._pos[item]
+        self._heap[i] = (key, item)
+        self._sift_up(i)
+
+    def peek(self) -> Tuple[float, T]:
+        """Smallest `(key, item)` without removing it."""
+        if self._hole:
+            self._fill_hole()
+        return self._heap[0]
+
+    def key(self, item: T) -> float:
+        return self._heap[self._pos[item]][0]
+
+    def items(self) -> List[Tuple[float, T]]:
+        """`(key, item)` pairs in heap-array order (for overlays) — a plain list copy."""
+        return self._heap[1:] if self._hole else self._heap[:]
+
+    # ------------------------------------------------------------------
+    # Sifting
+    # ------------------------------------------------------------------
+    def _fill_hole(self) -> None:
+        """Plain (unfused) pop completion: move the last slot up and sift down."""
+        self._hole = False
+        heap = self._heap
+        last = heap.pop()
+        heap[0] = last
+        self._pos[last[1]] = 0
+        self._sift_down(0)
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            p      = (i - 1) // _D
+            parent = heap[p]
+            if parent <= entry:
+                break
+            heap[i]        = parent
+            pos[parent[1]] = i
+            i = p
+        heap[i]       = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        n     = len(heap)
+        entry = heap[i]
+        while True:
+            first = _D * i + 1
+            if first >= n:
+                break
+            best   = first
+            best_e = heap[first]
+            for c in range(first + 1, min(first + _D, n)):
+                if heap[c] < best_e:
+                    best, best_e = c, heap[c]
+            if entry <= best_e:
+                break
+            heap[i]        = best_e
+            pos[best_e[1]] = i
+            i = best
+        heap[i]       = entry
+        pos[entry[1]] = i
+
+    # ------------------------------------------------------------------
+    # Dunder
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._heap) - self._hole
+
+    def __bool__(self) -> bool:
+        return len(self._heap) > self._hole
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._pos
+
+    def __repr__(self) -> str:
+        return f"Heap4(size={len(self)})"
@@ -15,19 +15,34 @@ needs to render one frame:
 
 Design decisions:
   - Step is a plain dataclass (no methods that mutate the graph).
-    It is a SNAPSHOT. The algorithm generator is the only writer;
-    the stepper / renderer are pure readers.
+    It is a SNAPSHOT.  Slotted, like StepBuilder, because a run keeps
+    thousands of them alive for replay — no per-instance __dict__.
+    The algorithm generator is the only writer; the stepper / renderer
+    are pure readers.  StepBuilder.build() hands its containers over
+    instead of copying them, so that contract is what keeps Steps intact.
   - `node_states` and `edge_states` are shallow dicts so the renderer
     can apply them in one pass without walking the whole graph.
   - `overlay` is a free-form dict so different algorithms can push
     whatever extra info they want (queue contents, relaxation detail, …).
+  - Steps may be DELTA-ENCODED: instead of copying whole maps / lists on
+    every step, a step can point at an earlier `keyframe` step and carry
+    only what changed since the previous step — distance changes,
+    visited-set additions, queue / stack pushes and pops, and "sticky"
+    node colours.  `materialize()` rebuilds the full snapshot when a
+    consumer actually needs one, so per-step cost is O(changes), not O(V).
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Tuple
 
+# Overlay keys that hold node sequences and may be delta-encoded (queue_deltas)
+SEQUENCE_OVERLAYS = frozenset({"queue", "stack", "queue_forward", "queue_backward"})
 
-@dataclass(frozen=True)
+# Default distance between keyframes for StepDeltas — bounds materialize() work
+KEYFRAME_INTERVAL = 64
+
+
+@dataclass(frozen=True, slots=True)
 class Step:
     """
     Attributes:
@@ -40,6 +55,23 @@ class Step:
         frontier        : List of node_ids currently in the queue / stack.
         path            : Ordered list of node_ids on the best path found so far (empty until done).
         distances       : {node_id: float} — current shortest-known distances (Dijkstra / A* / BF).
+                          Empty on delta-encoded steps (see keyframe).
+        distance_deltas : [(node_id, old, new)] — distance changes made by THIS step.
+        visited_deltas  : [("added" | "removed", node_id)] — visited_set changes made by THIS step.
+        queue_deltas    : [(name, op, node_id)] — changes to `frontier` (name "frontier")
+                          or a SEQUENCE_OVERLAYS overlay; op is "push" (append),
+                          "pop" (from the end), "popleft" or "discard" (drop every copy).
+        node_state_deltas : [(node_id, state)] — "sticky" colours that persist
+                          under later steps' node_states (state None clears
+                          one).  On a keyframe this is the complete sticky layer.
+        keyframe        : step_number of the last self-contained step, or None
+                          if this step is itself self-contained.  On a delta
+                          step distances / visited_set / frontier / sequence
+                          overlays are NOT stored: replaying the *_deltas of
+                          every step after the keyframe up to this one gives them.
+        batched_relaxations : [(edge_id, u, v, new_dist)] — relaxations applied
+                          silently since the previous Step (condensed `detail`
+                          levels), so the UI can still animate them.
         pseudocode_line : 0-based index of the pseudocode line executing now.
         explanation     : Human-readable "why" text for Learning Mode.
         overlay         : Free-form dict for algo-specific overlay data:
@@ -47,6 +79,8 @@ class Step:
                             • "stack"         – list of node_ids for DFS
                             • "relaxed_edge"  – (src, tgt, new_dist) just relaxed
                             • "matrix"        – current distance matrix for Floyd-Warshall
+                            • "matrix_deltas" – [(row, col, value)] matrix cells changed
+                                                by THIS step (delta steps carry no "matrix")
         metrics         : Running tally: nodes_visited, edges_relaxed, …
         is_final        : True on the very last step (path found or exhausted).
     """
@@ -60,6 +94,12 @@ class Step:
     frontier:         List[str]                    = field(default_factory=list)
     path:             List[str]                    = field(default_factory=list)
     distances:        Dict[str, float]             = field(default_factory=dict)
+    distance_deltas:  List[Tuple[str, float, float]] = field(default_factory=list)
+    visited_deltas:   List[Tuple[str, str]]        = field(default_factory=list)
+    queue_deltas:     List[Tuple[str, str, str]]   = field(default_factory=list)
+    node_state_deltas: List[Tuple[str, Optional[str]]] = field(default_factory=list)
+    keyframe:         Optional[int]                = None
+    batched_relaxations: List[Tuple[str, str, str, float]] = field(default_factory=list)
     pseudocode_line:  int                          = 0
     explanation:      str                          = ""
     overlay:          Dict[str, Any]               = field(default_factory=dict)
@@ -67,6 +107,73 @@ class Step:
     is_final:         bool                         = False
 
 
+def materialize(chain: Sequence[Step]) -> Step:
+    """
+    Resolve a delta-encoded step into a self-contained one.
+
+    `chain` runs from the keyframe step (chain[0]) to the step being
+    resolved (chain[-1]), inclusive and in order.  The result has full
+    `distances` (mirrored into overlay["distances"] if the keyframe had one
+    there), `visited_set`, `frontier`, sequence overlays and the "matrix"
+    overlay (from "matrix_deltas"), the sticky colours merged under its
+    own node_states, and keyframe=None.  A
+    sequence overlay the step carries itself (e.g. a priority queue of
+    (priority, node_id) pairs, which has no queue_deltas) is kept as is.
+    """
+    key, step = chain[0], chain[-1]
+    if step.keyframe is None:
+        return step
+
+    dist    = dict(key.distances)
+    visited = list(key.visited_set)
+    seqs    = {"frontier": list(key.frontier)}
+    for name in SEQUENCE_OVERLAYS.intersection(key.overlay).difference(step.overlay):
+        seqs[name] = list(key.overlay[name])
+    sticky  = dict(key.node_state_deltas)
+
+    for s in chain[1:]:
+        for nid, _, new in s.distance_deltas:
+            dist[nid] = new
+        for op, nid in s.visited_deltas:
+            if op == "added":
+                visited.append(nid)
+            else:
+                visited.remove(nid)
+        for name, op, nid in s.queue_deltas:
+            _SEQ_OPS[op](seqs.setdefault(name, []), nid)
+        for nid, state in s.node_state_deltas:
+            if state is None:
+                sticky.pop(nid, None)
+            else:
+                sticky[nid] = state
+
+    overlay = dict(step.overlay)
+    if "distances" in key.overlay:
+        overlay["distances"] = dist
+    if "matrix" in key.overlay:
+        matrix = [dict(row, values=list(row["values"])) for row in key.overlay["matrix"]]
+        for s in chain[1:]:
+            for i, j, value in s.overlay.get("matrix_deltas", ()):
+                matrix[i]["values"][j] = value
+        overlay["matrix"] = matrix
+    frontier = seqs.pop("frontier")
+    overlay.update(seqs)
+    sticky.update(step.node_states)
+    return replace(step, distances=dist, visited_set=visited, frontier=frontier,
+                   overlay=overlay, node_states=sticky, keyframe=None)
+
+
+def _discard(seq: List[str], nid: str) -> None:
+    seq[:] = [n for n in seq if n != nid]
+
+_SEQ_OPS: Dict[str, Callable[[List[str], str], None]] = {
+    "push":    list.append,
+    "pop":     lambda seq, nid: seq.pop(),
+    "popleft": lambda seq, nid: seq.pop(0),
+    "discard": _discard,
+}
+
+
 # ---------------------------------------------------------------------------
 # Convenience builder so algorithms don't have to spell out every kwarg
 # ---------------------------------------------------------------------------
@@ -82,10 +189,23 @@ class StepBuilder:
         yield sb.build(step_number=3)
     """
 
+    __slots__ = (
+        "current_node", "current_edge", "node_states", "edge_states",
+        "visited_set", "frontier", "path", "distances", "distance_deltas",
+        "visited_deltas", "queue_deltas", "node_state_deltas",
+        "keyframe", "batched_relaxations", "pseudocode_line",
+        "explanation", "overlay", "metrics", "is_final",
+    )
+
     def __init__(self):
         self.reset()
 
     def reset(self):
+        """
+        Blank the builder so ONE instance can serve a whole generator.
+        Every container is rebound, never cleared: build() hands the
+        current ones to its Step, which owns them from then on.
+        """
         self.current_node:     Optional[str]       = None
         self.current_edge:     Optional[str]       = None
         self.node_states:      Dict[str, str]      = {}
@@ -94,12 +214,26 @@ class StepBuilder:
         self.frontier:         List[str]           = []
         self.path:             List[str]           = []
         self.distances:        Dict[str, float]    = {}
+        self.distance_deltas:  List[Tuple[str, float, float]] = []
+        self.visited_deltas:   List[Tuple[str, str]] = []
+        self.queue_deltas:     List[Tuple[str, str, str]] = []
+        self.node_state_deltas: List[Tuple[str, Optional[str]]] = []
+        self.keyframe:         Optional[int]       = None
+        self.batched_relaxations: List[Tuple[str, str, str, float]] = []
         self.pseudocode_line:  int                 = 0
         self.explanation:      str                 = ""
         self.overlay:          Dict[str, Any]      = {}
         self.metrics:          Dict[str, Any]      = {"nodes_visited": 0, "edges_relaxed": 0, "path_length": 0}
         self.is_final:         bool                = False
 
+    def reset_edge_event(self, current: str, edge_id: str, line: int, explanation: str = ""):
+        """reset() and set up the common "examining edge X from node Y" step."""
+        self.reset()
+        self.set_current(current)
+        self.relax_edge(edge_id)
+        self.pseudocode_line = line
+        self.explanation     = explanation
+
     # -- helpers --
     def visit(self, node_id: str):
         self.node_states[node_id] = "visited"
@@ -111,9 +245,10 @@ class StepBuilder:
         self.current_node = node_id
         self.node_states[node_id] = "current"
 
-    def set_frontier(self, nodes: List[str]):
+    def set_frontier(self, nodes: Iterable[str]):
+        """Any iterable (list, set, dict keys, …) — copied once into `frontier`."""
         self.frontier = list(nodes)
-        for n in nodes:
+        for n in self.frontier:
             if n not in self.node_states or self.node_states[n] == "unvisited":
                 self.node_states[n] = "frontier"
 
@@ -125,6 +260,13 @@ class StepBuilder:
     def choose_edge(self, edge_id: str):
         self.edge_states[edge_id] = "chosen"
 
+    def set_distance_delta(self, node_id: str, old: float, new: float):
+        self.distance_deltas.append((node_id, old, new))
+
+    def add_batched_relaxation(self, edge_id: str, u: str, v: str, new_dist: float):
+        self.batched_relaxations.append((edge_id, u, v, new_dist))
+        self.metrics["edges_relaxed"] = self.metrics.get("edges_relaxed", 0) + 1
+
     def set_path(self, path: List[str]):
         self.path = path
         self.metrics["path_length"] = len(path) - 1 if len(path) > 1 else 0
@@ -132,19 +274,156 @@ class StepBuilder:
             self.node_states[n] = "path"
 
     def build(self, step_number: int = 0, is_final: bool = False) -> Step:
+        """
+        The Step takes the builder's containers as they are — no copies.
+        They belong to the Step from here on: reset() before touching the
+        builder again.
+        """
         return Step(
             step_number=step_number,
             current_node=self.current_node,
             current_edge=self.current_edge,
-            node_states=dict(self.node_states),
-            edge_states=dict(self.edge_states),
-            visited_set=list(self.visited_set),
-            frontier=list(self.frontier),
-            path=list(self.path),
-            distances=dict(self.distances),
+            node_states=self.node_states,
+            edge_states=self.edge_states,
+            visited_set=self.visited_set,
+            frontier=self.frontier,
+            path=self.path,
+            distances=self.distances,
+            distance_deltas=self.distance_deltas,
+            visited_deltas=self.visited_deltas,
+            queue_deltas=self.queue_deltas,
+            node_state_deltas=self.node_state_deltas,
+            keyframe=self.keyframe,
+            batched_relaxations=self.batched_relaxations,
             pseudocode_line=self.pseudocode_line,
             explanation=self.explanation,
-            overlay=dict(self.overlay),
-            metrics=dict(self.metrics),
+            overlay=self.overlay,
+            metrics=self.metrics,
             is_final=is_final,
         )
+
+
+# ---------------------------------------------------------------------------
+# Delta tracker for traversal generators
+# ---------------------------------------------------------------------------
+class StepDeltas:
+    """
+    Records visited / queue / distance / sticky-colour changes between
+    Steps so a traversal can emit O(changes) steps instead of copying its
+    whole visited set, queue and distance map every time.
+
+    The algorithm keeps its own authoritative structures and reports every
+    change here; `stamp()` then fills a StepBuilder either with the pending
+    deltas, or — every `interval` steps and whenever asked — with a full
+    keyframe built from the registered snapshot callables.
+
+    Usage:
+        d = StepDeltas()
+        d.track("queue",    lambda: list(queue))
+        d.track("frontier", lambda: list(queue))
+        ...
+        queue.append(n); d.push(n, "queue", "frontier"); d.add_visited(n)
+        d.stamp(sb, step_no)
+        yield sb.build(step_number=step_no)
+    """
+
+    __slots__ = ("interval", "keyframe", "visited", "painted", "_snapshots",
+                 "_distances", "_visited_d", "_queue_d", "_dist_d", "_paint_d")
+
+    def __init__(self, interval: int = KEYFRAME_INTERVAL):
+        self.interval:  int                = interval
+        self.keyframe:  Optional[int]      = None
+        self.visited:   List[str]          = []     # authoritative, insertion order
+        self.painted:   Dict[str, str]     = {}     # full sticky layer
+        self._snapshots: Dict[str, Callable[[], List[str]]] = {}
+        self._distances: Optional[Callable[[], Dict[str, float]]] = None
+        self._visited_d: List[Tuple[str, str]]      = []
+        self._queue_d:   List[Tuple[str, str, str]] = []
+        self._dist_d:    List[Tuple[str, float, float]] = []
+        self._paint_d:   List[Tuple[str, Optional[str]]] = []
+
+    # -- registration --
+    def track(self, name: str, snapshot: Callable[[], List[str]]) -> None:
+        """
+        `name` is "frontier" or a SEQUENCE_OVERLAYS key; `snapshot` lists it
+        for keyframes.  Names tracked with the same callable share one list
+        per keyframe (BFS's queue *is* its frontier).
+        """
+        self._snapshots[name] = snapshot
+
+    def track_distances(self, snapshot: Callable[[], Dict[str, float]]) -> None:
+        """
+        `snapshot` returns a fresh {node_id: dist} map for keyframes, which
+        also get it as overlay["distances"]; report changes with set_distance().
+        """
+        self._distances = snapshot
+
+    # -- change reporting --
+    def add_visited(self, node_id: str) -> None:
+        self.visited.append(node_id)
+        self._visited_d.append(("added", node_id))
+
+    def push(self, node_id: str, *names: str) -> None:
+        self._queue_d.extend((name, "push", node_id) for name in names)
+
+    def pop(self, node_id: str, *names: str) -> None:
+        self._queue_d.extend((name, "pop", node_id) for name in names)
+
+    def popleft(self, node_id: str, *names: str) -> None:
+        self._queue_d.extend((name, "popleft", node_id) for name in names)
+
+    def discard(self, node_id: str, *names: str) -> None:
+        self._queue_d.extend((name, "discard", node_id) for name in names)
+
+    def set_distance(self, node_id: str, old: float, new: float) -> None:
+        self._dist_d.append((node_id, old, new))
+
+    def paint(self, node_id: str, state: Optional[str]) -> None:
+        """Give a node a colour that persists until painted again (None clears it)."""
+        if self.painted.get(node_id) == state:
+            return
+        if state is None:
+            del self.painted[node_id]
+        else:
+            self.painted[node_id] = state
+        self._paint_d.append((node_id, state))
+
+    # -- emission --
+    def stamp(self, sb: StepBuilder, step_number: int, full: bool = False) -> None:
+        """
+        Write the state for `step_number` into `sb` (call after the
+        algorithm has set its own node_states).  Final steps should pass
+        full=True so they stay self-contained.
+        """
+        if full or self.keyframe is None or step_number - self.keyframe >= self.interval:
+            self.keyframe = step_number
+            sb.keyframe   = None
+            sb.visited_set = list(self.visited)
+            taken: Dict[Callable[[], List[str]], List[str]] = {}
+            for name, snapshot in self._snapshots.items():
+                seq = taken.get(snapshot)
+                if seq is None:
+                    seq = taken[snapshot] = snapshot()
+                if name == "frontier":
+                    sb.frontier = seq
+                else:
+                    sb.overlay[name] = seq
+            if self._distances is not None:
+                dist = self._distances()
+                sb.distances = dist            # shared with the overlay; Steps never mutate it
+                sb.overlay["distances"] = dist
+            sb.node_state_deltas = list(self.painted.items())
+            for nid, state in self.painted.items():
+                sb.node_states.setdefault(nid, state)
+        else:
+            sb.keyframe          = self.keyframe
+            sb.visited_set       = []          # rebuilt by materialize()
+            sb.frontier          = []
+            sb.visited_deltas    = self._visited_d
+            sb.queue_deltas      = self._queue_d
+            sb.distance_deltas   = self._dist_d
+            sb.node_state_deltas = self._paint_d
+        self._visited_d = []
+        self._queue_d   = []
+        self._dist_d    = []
+        self._paint_d   = []
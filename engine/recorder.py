@@ -11,16 +11,18 @@ Usage:
     rec.run_to_completion()          # exhausts the generator
     metrics = rec.get_metrics()      # the analytics card
     rec.export()                     # serialisable snapshot for save/replay
+    rec.export_stream(fp)            # … the same, written to fp as JSON
 
 Comparison Mode:
     The UI holds two Recorders (one per algo), runs both to completion
     on the SAME graph, then calls compare(rec1, rec2) → ComparisonResult.
 """
 
+import json
 import time
 import sys
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from dataclasses import asdict, dataclass, field
+from typing import Optional, List, Dict, Any, TextIO, Tuple
 
 from graph import Graph
 from algorithms import get_algorithm, AlgoInfo
@@ -30,8 +32,9 @@ from engine.stepper import Stepper
 
 # ---------------------------------------------------------------------------
 # Metrics dataclass — what the Analytics panel renders
+# (slotted: no per-instance __dict__, serialise with dataclasses.asdict)
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class RunMetrics:
     algo_key:        str   = ""
     algo_label:      str   = ""
@@ -52,7 +55,7 @@ class RunMetrics:
 # ---------------------------------------------------------------------------
 # ComparisonResult — side-by-side analytics
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class ComparisonResult:
     left:  RunMetrics = field(default_factory=RunMetrics)
     right: RunMetrics = field(default_factory=RunMetrics)
@@ -150,29 +153,33 @@ class Recorder:
     # Export (serialisable snapshot)
     # ------------------------------------------------------------------
     def export(self) -> Dict[str, Any]:
+        data = self._export_header()
+        data["steps"] = [_step_dict(s) for s in self.steps]
+        return data
+
+    def export_stream(self, fp: TextIO) -> None:
+        """
+        Write export() as JSON to the text file `fp`, one Step at a time,
+        so a long run is never held as dicts and as text all at once.
+        """
+        fp.write("{")
+        for key, value in self._export_header().items():
+            fp.write(f"{json.dumps(key)}: {json.dumps(value)}, ")
+        fp.write('"steps": [')
+        for i, s in enumerate(self.steps):
+            if i:
+                fp.write(", ")
+            json.dump(_step_dict(s), fp)
+        fp.write("]}")
+
+    def _export_header(self) -> Dict[str, Any]:
         return {
             "algo_key":  self._algo_info.key if self._algo_info else "",
             "source":    self._source,
             "target":    self._target,
             "heuristic": self._heuristic,
             "graph":     self._graph.to_dict() if self._graph else {},
-            "metrics":   self.metrics.__dict__ if self.metrics else {},
-            "steps": [
-                {
-                    "step_number":     s.step_number,
-                    "current_node":    s.current_node,
-                    "node_states":     s.node_states,
-                    "edge_states":     s.edge_states,
-                    "visited_set":     s.visited_set,
-                    "frontier":        s.frontier,
-                    "path":            s.path,
-                    "distances":       s.distances,
-                    "pseudocode_line": s.pseudocode_line,
-                    "explanation":     s.explanation,
-                    "is_final":        s.is_final,
-                }
-                for s in self.steps
-            ],
+            "metrics":   asdict(self.metrics) if self.metrics else {},
         }
 
     # ------------------------------------------------------------------
@@ -187,18 +194,21 @@ class Recorder:
         path          = last.path              if last else []
         path_found    = bool(path)
 
-        # path cost: sum edge weights along the path
+        # path cost: the final Step marks the path's edges "chosen" (the
+        # arcs the search actually took).  Map each one to the hop(s) it
+        # covers, then add one weight per hop of the path — a hop walked
+        # twice (a path around a negative cycle) counts twice
         path_cost = 0.0
         if self._graph and len(path) > 1:
-            for i in range(len(path) - 1):
-                e = self._graph.get_edge_between(path[i], path[i + 1])
-                if e:
-                    path_cost += e.weight
+            hop_w = _chosen_hop_weights(self._graph, last.edge_states)
+            for hop in zip(path, path[1:]):
+                path_cost += hop_w.get(hop, 0.0)
 
-        # approximate memory: sizeof the steps buffer
+        # approximate memory: sizeof the steps buffer.  Step is slotted, so
+        # every Step has the same shallow size — no need to ask each one
         mem = sys.getsizeof(self.steps)
-        for s in self.steps:
-            mem += sys.getsizeof(s)
+        if self.steps:
+            mem += len(self.steps) * sys.getsizeof(self.steps[0])
 
         neg_cycle = False
         if last and last.overlay.get("negative_cycle"):
@@ -222,6 +232,52 @@ class Recorder:
         )
 
 
+# ---------------------------------------------------------------------------
+# Metrics helper
+# ---------------------------------------------------------------------------
+def _chosen_hop_weights(graph: Graph, edge_states: Dict[str, str]) -> Dict[Tuple[str, str], float]:
+    """
+    {(a, b): weight} for every hop a → b a "chosen" edge can stand for:
+    both directions of an undirected edge, source → target of a directed
+    one.
+    """
+    edges = graph.edges
+    chosen = [edges[eid] for eid, state in edge_states.items()
+              if state == "chosen" and eid in edges]
+    hop_w: Dict[Tuple[str, str], float] = {}
+    for e in chosen:
+        hop_w.setdefault((e.source, e.target), e.weight)
+        if not e.directed:
+            hop_w.setdefault((e.target, e.source), e.weight)
+    return hop_w
+
+
+# ---------------------------------------------------------------------------
+# Export helper
+# ---------------------------------------------------------------------------
+def _step_dict(s: Step) -> Dict[str, Any]:
+    """One entry of export()["steps"]."""
+    return {
+        "step_number":     s.step_number,
+        "current_node":    s.current_node,
+        "node_states":     s.node_states,
+        "edge_states":     s.edge_states,
+        "visited_set":     s.visited_set,
+        "frontier":        s.frontier,
+        "path":            s.path,
+        "distances":       s.distances,
+        "distance_deltas": s.distance_deltas,
+        "visited_deltas":  s.visited_deltas,
+        "queue_deltas":    s.queue_deltas,
+        "node_state_deltas": s.node_state_deltas,
+        "keyframe":        s.keyframe,
+        "batched_relaxations": s.batched_relaxations,
+        "pseudocode_line": s.pseudocode_line,
+        "explanation":     s.explanation,
+        "is_final":        s.is_final,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Comparison helper
 # ---------------------------------------------------------------------------
@@ -230,17 +286,18 @@ def compare(left: Recorder, right: Recorder) -> ComparisonResult:
     l = left.metrics  or RunMetrics()
     r = right.metrics or RunMetrics()
 
-    def winner(l_val, r_val, l_key, r_key, lower_is_better=True):
-        if l_val == r_val:
-            return "tie"
-        if lower_is_better:
-            return l_key if l_val < r_val else r_key
-        return l_key if l_val > r_val else r_key
-
     return ComparisonResult(
         left=l,
         right=r,
-        winner_nodes=winner(l.nodes_visited, r.nodes_visited, l.algo_label, r.algo_label),
-        winner_edges=winner(l.edges_relaxed, r.edges_relaxed, l.algo_label, r.algo_label),
-        winner_path =winner(l.path_cost, r.path_cost, l.algo_label, r.algo_label),
+        winner_nodes=_winner(l.nodes_visited, r.nodes_visited, l.algo_label, r.algo_label),
+        winner_edges=_winner(l.edges_relaxed, r.edges_relaxed, l.algo_label, r.algo_label),
+        winner_path =_winner(l.path_cost, r.path_cost, l.algo_label, r.algo_label),
     )
+
+
+def _winner(l_val, r_val, l_key: str, r_key: str, lower_is_better: bool = True) -> str:
+    if l_val == r_val:
+        return "tie"
+    if lower_is_better:
+        return l_key if l_val < r_val else r_key
+    return l_key if l_val > r_val else r_key
@@ -12,6 +12,15 @@ State machine:
     PLAYING →  (step exhausted) → FINISHED
     any     →  reset()  →  IDLE
 
+Bounded history:
+  By default every Step stays buffered.  `Stepper(window=N)` keeps only
+  the newest N; rewinding past them re-runs the algorithm from a fresh
+  generator (the `restart` callable given to start()) up to the step
+  asked for — generators are deterministic, so the replay yields the
+  same Steps.  A delta-encoded Step still needs its keyframe to be
+  materialised, so size the window with that in mind.  The Recorder
+  needs the full run and uses the default.
+
 Thread safety:
   This class is NOT thread-safe.  The UI must call advance() / play()
   from a single thread (or use an async event loop).  For the browser-
@@ -20,8 +29,10 @@ Thread safety:
 """
 
 import time
+from collections import deque
 from enum import Enum
-from typing import Generator, Optional, Callable, List
+from itertools import islice
+from typing import Generator, Optional, Callable, List, Deque, Union
 
 from algorithms.step import Step
 
@@ -54,31 +65,50 @@ class Stepper:
     """
     Attributes:
         state       : Current StepperState.
-        steps       : List of all Steps yielded so far (buffer for rewind).
-        current_idx : Index into `steps` that is currently displayed.
+        steps       : Steps yielded so far (buffer for rewind) — all of them,
+                      or the newest `window` in a deque.
+        current_idx : Step number currently displayed (steps[current_idx]
+                      when nothing has been dropped).
         speed       : Seconds between auto-advance ticks.
         on_step     : Optional callback(Step) fired every time current step changes.
                       The UI hooks its re-render here.
     """
 
-    def __init__(self, on_step: Optional[Callable[[Step], None]] = None):
+    def __init__(
+        self,
+        on_step: Optional[Callable[[Step], None]] = None,
+        window: Optional[int] = None,
+    ):
         self._generator:  Optional[Generator[Step, None, None]] = None
-        self.steps:       List[Step]    = []
+        self._restart:    Optional[Callable[[], Generator[Step, None, None]]] = None
+        self.window:      Optional[int] = window
+        self.steps:       Union[List[Step], Deque[Step]] = self._new_buffer()
+        self._base:       int          = 0     # step number of steps[0]
         self.current_idx: int          = -1
         self.state:       StepperState = StepperState.IDLE
         self.speed:       float        = SPEED_PRESETS["medium"]
         self.on_step:     Optional[Callable[[Step], None]] = on_step
 
-        # for auto-play timing
-        self._last_tick:  float = 0.0
+        # for auto-play timing: monotonic time of the next auto-advance
+        self._deadline:   float = 0.0
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
-    def start(self, generator: Generator[Step, None, None]) -> None:
-        """Attach a fresh algorithm generator and load the first step."""
+    def start(
+        self,
+        generator: Generator[Step, None, None],
+        restart: Optional[Callable[[], Generator[Step, None, None]]] = None,
+    ) -> None:
+        """
+        Attach a fresh algorithm generator and load the first step.
+        `restart` returns a new generator for the same run; with a
+        `window` it is what lets prev / goto reach dropped steps.
+        """
         self._generator  = generator
-        self.steps       = []
+        self._restart    = restart
+        self.steps       = self._new_buffer()
+        self._base       = 0
         self.current_idx = -1
         self.state       = StepperState.PAUSED
         # eagerly fetch step 0 so the UI can show the initial state
@@ -88,10 +118,11 @@ class Stepper:
     def reset(self) -> None:
         """Back to IDLE — caller must call start() again."""
         self._generator  = None
-        self.steps       = []
+        self._restart    = None
+        self.steps       = self._new_buffer()
+        self._base       = 0
         self.current_idx = -1
         self.state       = StepperState.IDLE
-        self._notify(None)
 
     # ------------------------------------------------------------------
     # Navigation
@@ -100,7 +131,7 @@ class Stepper:
         """Advance one step forward.  Returns False if already at end."""
         target = self.current_idx + 1
         # if we haven't fetched this step yet, try
-        if target >= len(self.steps):
+        if target >= self._end:
             if not self._fetch_next():
                 self.state = StepperState.FINISHED
                 return False
@@ -111,30 +142,29 @@ class Stepper:
         """Rewind one step.  Returns False if already at start."""
         if self.current_idx <= 0:
             return False
-        self._goto(self.current_idx - 1)
-        return True
+        return self.goto_step(self.current_idx - 1)
 
     def goto_step(self, idx: int) -> bool:
-        """Jump to an arbitrary buffered step index."""
+        """Jump to an arbitrary step index (fetching or replaying as needed)."""
+        if idx < self._base and not self._replay_to(idx):
+            return False
         # fetch forward if needed
-        while idx >= len(self.steps):
-            if not self._fetch_next():
-                break
-        if 0 <= idx < len(self.steps):
+        if idx >= self._end:
+            self._fetch_many(idx + 1 - self._end)
+        if 0 <= idx < self._end:
             self._goto(idx)
             return True
         return False
 
     def rewind(self) -> None:
         """Jump back to step 0."""
-        self._goto(0)
+        self.goto_step(0)
 
     def jump_to_end(self) -> None:
         """Exhaust the generator and jump to the final step."""
-        while self._fetch_next():
-            pass
+        self._fetch_many()
         if self.steps:
-            self._goto(len(self.steps) - 1)
+            self._goto(self._end - 1)
         self.state = StepperState.FINISHED
 
     # ------------------------------------------------------------------
@@ -143,8 +173,8 @@ class Stepper:
     def play(self) -> None:
         if self.state == StepperState.FINISHED:
             return
-        self.state      = StepperState.PLAYING
-        self._last_tick = time.monotonic()
+        self.state     = StepperState.PLAYING
+        self._deadline = time.monotonic() + self.speed
 
     def pause(self) -> None:
         self.state = StepperState.PAUSED
@@ -164,38 +194,35 @@ class Stepper:
         time has elapsed, advances one step.  Returns True if a step
         was taken.
         """
-        if self.state != StepperState.PLAYING:
+        if self.state is not StepperState.PLAYING:
             return False
         now = time.monotonic()
-        if now - self._last_tick >= self.speed:
-            self._last_tick = now
-            if not self.next_step():
-                self.state = StepperState.FINISHED
-                return False
-            return True
-        return False
+        if now < self._deadline:
+            return False
+        self._deadline = now + self.speed
+        return self.next_step()            # sets FINISHED at the end
 
     # ------------------------------------------------------------------
     # Speed
     # ------------------------------------------------------------------
     def set_speed(self, preset: str) -> None:
-        self.speed = SPEED_PRESETS.get(preset, 0.4)
+        self._set_speed(SPEED_PRESETS.get(preset, 0.4))
 
     def set_speed_value(self, seconds: float) -> None:
-        self.speed = max(0.02, seconds)
+        self._set_speed(max(0.02, seconds))
 
     # ------------------------------------------------------------------
     # Read-only accessors
     # ------------------------------------------------------------------
     @property
     def current_step(self) -> Optional[Step]:
-        if 0 <= self.current_idx < len(self.steps):
-            return self.steps[self.current_idx]
+        if self._base <= self.current_idx < self._end:
+            return self.steps[self.current_idx - self._base]
         return None
 
     @property
     def total_steps_fetched(self) -> int:
-        return len(self.steps)
+        return self._end
 
     @property
     def is_finished(self) -> bool:
@@ -214,15 +241,60 @@ class Stepper:
             return False
         try:
             step = next(self._generator)
+            if len(self.steps) == self.window:
+                self._base += 1            # the deque drops steps[0]
             self.steps.append(step)
             return True
         except StopIteration:
             return False
 
+    def _fetch_many(self, n: Optional[int] = None) -> None:
+        """
+        Pull the next `n` Steps (all that are left if None) into the
+        buffer.  An unbounded buffer is extended straight from the
+        generator, so the per-Step loop runs inside list.extend instead of
+        one _fetch_next call (and try/except) per Step.
+        """
+        if self._generator is None:
+            return
+        steps = self._generator if n is None else islice(self._generator, n)
+        if self.window is None:
+            self.steps.extend(steps)
+            return
+        for step in steps:
+            if len(self.steps) == self.window:
+                self._base += 1            # the deque drops steps[0]
+            self.steps.append(step)
+
+    def _replay_to(self, idx: int) -> bool:
+        """
+        Re-run from a fresh generator until step `idx` is the newest in
+        the buffer, so the steps just before it (what further prev_step
+        calls want) are buffered too.  False without a `restart`.
+        """
+        if self._restart is None:
+            return False
+        self._generator = self._restart()
+        self.steps      = self._new_buffer()
+        self._base      = 0
+        self._fetch_many(idx + 1)
+        return idx < self._end
+
+    def _set_speed(self, seconds: float) -> None:
+        # a pending auto-advance moves too, as if timed at the new speed
+        self._deadline += seconds - self.speed
+        self.speed      = seconds
+
+    def _new_buffer(self) -> Union[List[Step], Deque[Step]]:
+        return [] if self.window is None else deque(maxlen=self.window)
+
+    @property
+    def _end(self) -> int:
+        """One past the step number of the newest buffered Step."""
+        return self._base + len(self.steps)
+
     def _goto(self, idx: int) -> None:
         self.current_idx = idx
-        self._notify(self.steps[idx] if 0 <= idx < len(self.steps) else None)
-
-    def _notify(self, step: Optional[Step]) -> None:
-        if self.on_step and step is not None:
-            self.on_step(step)
+        # no callback (e.g. the Recorder's Stepper): don't even look the Step up
+        if self.on_step is not None and self._base <= idx < self._end:
+            self.on_step(self.steps[idx - self._base])
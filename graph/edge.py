@@ -13,13 +13,40 @@ Design decisions:
   - `directed` is stored per-edge so a single Graph can technically mix,
     though in practice the Graph-level flag controls generation.
   - `meta` mirrors the Node pattern: algorithms can stash whatever they need.
+  - Ids default to "e<hex>" from a process-wide counter: generating a 100k
+    edge graph no longer reads 16 random bytes per edge.  Any explicit id
+    of that form (a loaded graph, create_edge(edge_id=…)) moves the counter
+    past it, so a default id never repeats one; `Edge.new_with_uuid` is
+    there for ids that must be unique across processes.
 """
 
+import re
 from enum import Enum
 from typing import Optional, Dict, Any
 import uuid
 
 
+# ---------------------------------------------------------------------------
+# Default edge ids — "e0", "e1", … "ea", … from one counter per process
+# ---------------------------------------------------------------------------
+_eid = 0                        # next counter value to hand out
+_COUNTER_ID = re.compile(r"e([0-9a-f]+)")
+
+
+def _next_id() -> str:
+    global _eid
+    n, _eid = _eid, _eid + 1
+    return f"e{n:x}"
+
+
+def _claim_id(edge_id: str) -> None:
+    """Move the counter past an explicit `edge_id` if it has the counter's form."""
+    global _eid
+    m = _COUNTER_ID.fullmatch(edge_id)
+    if m is not None:
+        _eid = max(_eid, int(m.group(1), 16) + 1)
+
+
 # ---------------------------------------------------------------------------
 # Edge State Enum — visual encoding for the renderer
 # ---------------------------------------------------------------------------
@@ -56,7 +83,9 @@ class Edge:
         directed: bool = False,
         edge_id: Optional[str] = None,
     ):
-        self.id:       str       = edge_id or str(uuid.uuid4())[:8]
+        if edge_id:
+            _claim_id(edge_id)
+        self.id:       str       = edge_id or _next_id()
         self.source:   str       = source
         self.target:   str       = target
         self.weight:   float     = weight
@@ -64,6 +93,17 @@ class Edge:
         self.state:    EdgeState = EdgeState.DEFAULT
         self.meta:     Dict[str, Any] = {}
 
+    @classmethod
+    def new_with_uuid(
+        cls,
+        source: str,
+        target: str,
+        weight: float = 1.0,
+        directed: bool = False,
+    ) -> "Edge":
+        """Edge with a random uuid-style id instead of a counter id."""
+        return cls(source, target, weight, directed, edge_id=str(uuid.uuid4())[:8])
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -16,19 +16,85 @@ Design decisions:
   - Nodes & edges stored in plain dicts keyed by id for O(1) lookup.
   - A separate adjacency dict  `_adj[node_id] → [(neighbour_id, edge_id)]`
     is maintained incrementally so neighbour queries are O(degree), not O(E).
+    `_in_adj` holds the reverse of each directed edge, so removing a node
+    finds its incoming edges in O(degree) too.
   - `directed` is a graph-level flag; individual Edge objects also carry it
     so serialisation is self-contained.
+  - Hot algorithm loops don't walk Node/Edge objects at all: `as_csr()` and
+    `as_soa()` flatten the graph into parallel int/float lists (nodes
+    numbered 0…V-1 in insertion order) so each arc costs a few list
+    indexings instead of dict lookups + attribute hops.  The views are
+    cached and shared between callers — treat them as read-only.
 """
 
 import random
 import math
 from typing import (
-    Dict, List, Tuple, Optional, Set, Iterator
+    Dict, List, Tuple, Optional, Set, Iterator, NamedTuple
 )
 from graph.node import Node, NodeState
 from graph.edge import Edge, EdgeState
 
 
+# ---------------------------------------------------------------------------
+# Flat views — see Graph.as_csr() / Graph.as_soa()
+# ---------------------------------------------------------------------------
+class CSR(NamedTuple):
+    """
+    Compressed-sparse-row adjacency.  The arcs leaving node i are the slots
+    indptr[i] … indptr[i+1]-1 of nbrs / w / edge_ids, in the same order as
+    `Graph.neighbours()`.  Undirected edges appear once from each end.
+    Searches keep all their state by node idx and map back through `ids`
+    only when they build a Step.
+
+    The int columns are plain lists, not array('i'): an array stores 4
+    bytes per slot but boxes a fresh int on every read, which makes the
+    per-arc loads in the traversal loops ~1.6x slower in CPython.
+    """
+    ids:      List[str]           # idx → node id
+    index:    Dict[str, int]      # node id → idx
+    indptr:   List[int]           # len V+1
+    nbrs:     List[int]           # len = number of arcs
+    w:        List[float]
+    edge_ids: List[str]
+    blocked:  bytearray           # blocked[idx] == 1 → obstacle
+
+
+class EdgeSoA(NamedTuple):
+    """
+    Structure-of-arrays edge list: arc k runs src[k] → tgt[k] with weight
+    w[k].  Undirected edges contribute a forward arc immediately followed
+    by its reverse, matching the order Bellman-Ford has always scanned.
+    """
+    ids:      List[str]
+    index:    Dict[str, int]
+    src:      List[int]
+    tgt:      List[int]
+    w:        List[float]
+    edge_ids: List[str]
+    blocked:  bytearray
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _find(parent: List[int], i: int) -> int:
+    """Union-find root of i, halving the path as it goes."""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _unlink(adj: Optional[List[Tuple[str, str]]], entry: Tuple[str, str]) -> None:
+    """Remove one adjacency entry in place, if present."""
+    if adj is not None:
+        try:
+            adj.remove(entry)
+        except ValueError:
+            pass
+
+
 class Graph:
     """
     Attributes:
@@ -37,6 +103,10 @@ class Graph:
         directed   : bool – graph-level directedness
         weighted   : bool – whether weights are meaningful
         _adj       : {node_id: [(neighbour_id, edge_id), …]}
+        _in_adj    : {node_id: [(source_id, edge_id), …]} — directed edges only
+        _node_ids  : cached idx → node_id list (None = stale), see node_index
+        _node_index: cached node_id → idx dict
+        _csr, _soa : cached flat views (None = stale), see as_csr / as_soa
     """
 
     def __init__(self, directed: bool = False, weighted: bool = True):
@@ -45,11 +115,18 @@ class Graph:
         self.directed: bool           = directed
         self.weighted: bool           = weighted
         self._adj:     Dict[str, List[Tuple[str, str]]] = {}   # node_id → [(nbr, edge_id)]
+        self._in_adj:  Dict[str, List[Tuple[str, str]]] = {}   # node_id → [(src, edge_id)], directed
+        self._node_ids:   Optional[List[str]]      = None
+        self._node_index: Optional[Dict[str, int]] = None
+        self._csr:        Optional[CSR]            = None
+        self._soa:        Optional[EdgeSoA]        = None
 
     # ==================================================================
     # NODE CRUD
     # ==================================================================
     def add_node(self, node: Node) -> Node:
+        if node.id not in self.nodes:
+            self._invalidate_index()
         self.nodes[node.id] = node
         self._adj.setdefault(node.id, [])
         return node
@@ -61,12 +138,16 @@ class Graph:
     def remove_node(self, node_id: str) -> None:
         if node_id not in self.nodes:
             return
-        # remove every edge touching this node
-        edge_ids_to_remove = [eid for eid in self.edges if self.edges[eid].source == node_id or self.edges[eid].target == node_id]
-        for eid in edge_ids_to_remove:
+        # remove every edge touching this node: out- and undirected edges
+        # from _adj, incoming directed ones from _in_adj (deduplicated —
+        # a self-loop is in both)
+        incident = self._adj.get(node_id, []) + self._in_adj.get(node_id, [])
+        for eid in dict.fromkeys(eid for _, eid in incident):
             self.remove_edge(eid)
         del self.nodes[node_id]
         self._adj.pop(node_id, None)
+        self._in_adj.pop(node_id, None)
+        self._invalidate_index()
 
     def get_node(self, node_id: str) -> Optional[Node]:
         return self.nodes.get(node_id)
@@ -76,10 +157,13 @@ class Graph:
     # ==================================================================
     def add_edge(self, edge: Edge) -> Edge:
         self.edges[edge.id] = edge
+        self.invalidate_views()
         # maintain adjacency
         self._adj.setdefault(edge.source, []).append((edge.target, edge.id))
         if not edge.directed:
             self._adj.setdefault(edge.target, []).append((edge.source, edge.id))
+        else:
+            self._in_adj.setdefault(edge.target, []).append((edge.source, edge.id))
         return edge
 
     def create_edge(self, source: str, target: str, weight: float = 1.0, edge_id: Optional[str] = None) -> Edge:
@@ -89,10 +173,16 @@ class Graph:
         if edge_id not in self.edges:
             return
         e = self.edges[edge_id]
-        self._adj.get(e.source, [])[:] = [(n, eid) for n, eid in self._adj.get(e.source, []) if eid != edge_id]
+        # drop the exact entries add_edge appended: list.remove finds and
+        # deletes them in place (C-level compare, no new list) and keeps
+        # the remaining neighbours in insertion order
+        _unlink(self._adj.get(e.source), (e.target, edge_id))
         if not e.directed:
-            self._adj.get(e.target, [])[:] = [(n, eid) for n, eid in self._adj.get(e.target, []) if eid != edge_id]
+            _unlink(self._adj.get(e.target), (e.source, edge_id))
+        else:
+            _unlink(self._in_adj.get(e.target), (e.source, edge_id))
         del self.edges[edge_id]
+        self.invalidate_views()
 
     def get_edge(self, edge_id: str) -> Optional[Edge]:
         return self.edges.get(edge_id)
@@ -121,6 +211,104 @@ class Graph:
     def degree(self, node_id: str) -> int:
         return len(self._adj.get(node_id, []))
 
+    # ==================================================================
+    # FLAT VIEWS (for algorithm inner loops)
+    # ==================================================================
+    @property
+    def node_index(self) -> Dict[str, int]:
+        """
+        {node_id: idx} — dense ints 0…V-1 in insertion order.  Algorithms
+        work on these ints internally and map back to ids only for Steps.
+        Cached; rebuilt after nodes are added or removed.
+        """
+        return self._index()[1]
+
+    def as_csr(self, *extra: str) -> CSR:
+        """
+        The adjacency as a CSR (see the CSR docstring).  Built lazily and
+        cached until the structure changes; only the blocked mask is
+        recomputed per call, since obstacles toggle between runs.
+
+        Ids in `extra` that are not in the graph (e.g. a stale source typed
+        by the user) get edge-less slots after the real nodes, so callers
+        can still address them by idx.  Only that rare case copies.
+        """
+        if self._csr is None:
+            self._csr = self._build_csr()
+        csr = self._csr._replace(blocked=self._blocked_mask(self._csr.ids))
+        missing = [nid for nid in dict.fromkeys(extra) if nid not in csr.index]
+        if not missing:
+            return csr
+        V     = len(csr.ids)
+        index = dict(csr.index)
+        index.update((nid, V + i) for i, nid in enumerate(missing))
+        return csr._replace(
+            ids=csr.ids + missing, index=index,
+            indptr=csr.indptr + [csr.indptr[-1]] * len(missing),
+            blocked=csr.blocked + bytes(len(missing)),
+        )
+
+    def as_soa(self) -> EdgeSoA:
+        """Every traversable arc as parallel lists.  Cached like as_csr()."""
+        if self._soa is None:
+            self._soa = self._build_soa()
+        return self._soa._replace(blocked=self._blocked_mask(self._soa.ids))
+
+    def invalidate_views(self) -> None:
+        """
+        Drop the cached CSR / SoA.  Called automatically by every add_* /
+        remove_* method; call it yourself only after editing an existing
+        Edge's weight in place (the views capture weights when built).
+        """
+        self._csr = None
+        self._soa = None
+
+    def _index(self) -> Tuple[List[str], Dict[str, int]]:
+        if self._node_index is None:
+            self._node_ids   = list(self.nodes)
+            self._node_index = {nid: i for i, nid in enumerate(self._node_ids)}
+        return self._node_ids, self._node_index
+
+    def _invalidate_index(self) -> None:
+        self._node_ids = self._node_index = None
+        self.invalidate_views()
+
+    def _build_csr(self) -> CSR:
+        ids, index = self._index()
+        indptr: List[int]   = [0]
+        nbrs:   List[int]   = []
+        w:      List[float] = []
+        eids:   List[str]   = []
+        for nid in ids:
+            for nbr, eid in self._adj.get(nid, []):
+                j = index.get(nbr)
+                if j is None:
+                    continue                # dangling edge — nothing to visit
+                nbrs.append(j)
+                w.append(self.edges[eid].weight)
+                eids.append(eid)
+            indptr.append(len(nbrs))
+        return CSR(ids, index, indptr, nbrs, w, eids, bytearray())
+
+    def _build_soa(self) -> EdgeSoA:
+        ids, index = self._index()
+        src:  List[int]   = []
+        tgt:  List[int]   = []
+        w:    List[float] = []
+        eids: List[str]   = []
+        for e in self.edges.values():
+            u, v = index.get(e.source), index.get(e.target)
+            if u is None or v is None:
+                continue
+            src.append(u); tgt.append(v); w.append(e.weight); eids.append(e.id)
+            if not e.directed:
+                src.append(v); tgt.append(u); w.append(e.weight); eids.append(e.id)
+        return EdgeSoA(ids, index, src, tgt, w, eids, bytearray())
+
+    def _blocked_mask(self, ids: List[str]) -> bytearray:
+        nodes = self.nodes
+        return bytearray(1 if nodes[nid].blocked else 0 for nid in ids)
+
     # ==================================================================
     # RESET (keep structure, wipe algo state)
     # ==================================================================
@@ -134,6 +322,8 @@ class Graph:
         self.nodes.clear()
         self.edges.clear()
         self._adj.clear()
+        self._in_adj.clear()
+        self._invalidate_index()
 
     # ==================================================================
     # SERIALISATION
@@ -196,23 +386,56 @@ class Graph:
             g.create_node(x, y, label=nid, node_id=nid)
             ids.append(nid)
 
-        # add edges
-        for i in range(num_nodes):
-            start = i + 1 if not directed else 0
-            for j in (range(start, num_nodes) if not directed else range(num_nodes)):
-                if i == j:
-                    continue
-                if random.random() < edge_probability:
+        # add edges: each candidate j of row i (j > i, or j != i if directed)
+        # with probability p.  Rather than one random() per candidate, draw
+        # the geometric gap to the next included one — O(V + E) draws
+        # instead of O(V²), same distribution
+        p = edge_probability
+        comp = list(range(num_nodes))     # union-find over node idx (undirected)
+        if p > 0:
+            every = p >= 1                           # every candidate, no gaps to draw
+            # log1p: for tiny p, log(1.0 - p) rounds to 0.0
+            log_q = 0.0 if every else math.log1p(-p)
+            for i in range(num_nodes):
+                first = 0 if directed else i + 1
+                count = num_nodes - 1 if directed else num_nodes - i - 1
+                c = -1                               # candidate position in row i
+                while True:
+                    c += 1
+                    if not every:
+                        gap = math.log1p(-random.random()) / log_q
+                        if c + gap >= count:         # compared as float: gap may be huge / inf
+                            break
+                        c += int(gap)
+                    if c >= count:
+                        break
+                    j = first + c
+                    if directed and j >= i:
+                        j += 1                       # skip the diagonal
                     w = random.randint(*weight_range) if weighted else 1
                     g.create_edge(ids[i], ids[j], weight=w)
-
-        # guarantee connectivity: add a spanning-tree backbone
-        shuffled = list(ids)
-        random.shuffle(shuffled)
-        for k in range(1, len(shuffled)):
-            if not g.get_edge_between(shuffled[k - 1], shuffled[k]):
-                w = random.randint(*weight_range) if weighted else 1
-                g.create_edge(shuffled[k - 1], shuffled[k], weight=w)
+                    if not directed:
+                        comp[_find(comp, i)] = _find(comp, j)
+
+        # guarantee connectivity: walk the nodes in random order and link
+        # consecutive ones.  Undirected, only where they are still in
+        # different components — exactly (components - 1) new edges.
+        # Directed, every missing arc: the path keeps shuffled[0] able to
+        # reach every node, which union-find can't tell.
+        order = list(range(num_nodes))
+        random.shuffle(order)
+        for k in range(1, num_nodes):
+            a, b = order[k - 1], order[k]
+            if directed:
+                if g.get_edge_between(ids[a], ids[b]):
+                    continue
+            else:
+                ra, rb = _find(comp, a), _find(comp, b)
+                if ra == rb:
+                    continue
+                comp[ra] = rb
+            w = random.randint(*weight_range) if weighted else 1
+            g.create_edge(ids[a], ids[b], weight=w)
 
         return g
 
@@ -313,8 +536,12 @@ class Graph:
                 w = random.randint(*weight_range) if weighted else 1
                 g.create_edge(ids[i], ids[j], weight=w)
 
-        # degree list for preferential attachment sampling
-        degrees = {nid: initial - 1 for nid in ids}   # clique → each has (initial-1) edges
+        # urn for preferential attachment sampling: every node appears once
+        # per incident edge, so a uniform pick from it is degree-proportional
+        endpoints: List[str] = []
+        for e in g.edges.values():
+            endpoints.append(e.source)
+            endpoints.append(e.target)
 
         # grow
         for i in range(initial, num_nodes):
@@ -328,28 +555,21 @@ class Graph:
             nid   = str(i)
             g.create_node(x, y, label=nid, node_id=nid)
             ids.append(nid)
-            degrees[nid] = 0
 
-            # pick m targets via preferential attachment
-            total_deg = sum(degrees.values()) or 1
-            targets: Set[str] = set()
+            # pick m distinct targets via preferential attachment (dict =
+            # insertion-ordered set, so a seed always gives the same graph)
+            targets: Dict[str, None] = {}
             attempts = 0
             while len(targets) < m and attempts < m * 20:
-                r = random.random() * total_deg
-                cumul = 0
-                for cand, deg in degrees.items():
-                    cumul += max(deg, 1)   # floor at 1 so isolated nodes can be picked
-                    if cumul >= r:
-                        if cand != nid:
-                            targets.add(cand)
-                        break
+                t = random.choice(endpoints) if endpoints else random.choice(ids[:-1])
+                targets[t] = None
                 attempts += 1
 
             for t in targets:
                 w = random.randint(*weight_range) if weighted else 1
                 g.create_edge(nid, t, weight=w)
-                degrees[nid]  = degrees.get(nid, 0) + 1
-                degrees[t]    = degrees.get(t, 0) + 1
+                endpoints.append(nid)
+                endpoints.append(t)
 
         return g
 
@@ -432,11 +652,13 @@ class Graph:
             y = cy + radius * math.sin(angle)
             g.create_node(x, y, label=label, node_id=label)
 
-        # add edges (deduplicate for undirected)
-        seen_edges: Set[frozenset] = set()
+        # add edges (deduplicate; undirected A–B and B–A are one edge).
+        # Lines may list an edge from either end or twice, so a set is
+        # needed — keyed by an ordered tuple, cheaper than a frozenset
+        seen_edges: Set[Tuple[str, str]] = set()
         for src, targets in adjacency.items():
             for tgt, w in targets:
-                key = frozenset([src, tgt]) if not directed else (src, tgt)
+                key = (tgt, src) if not directed and tgt < src else (src, tgt)
                 if key in seen_edges:
                     continue
                 seen_edges.add(key)
@@ -487,11 +709,10 @@ class Graph:
             labels = first_tokens
             rows_raw = rows_raw[1:]
 
-        # parse matrix
-        matrix: List[List[float]] = []
-        for row in rows_raw:
-            vals = row.replace(",", " ").split()
-            matrix.append([float(v) for v in vals])
+        # parse matrix (map(float, …) converts a row in C, no per-cell bytecode)
+        matrix: List[List[float]] = [
+            list(map(float, row.replace(",", " ").split())) for row in rows_raw
+        ]
 
         n = len(matrix)
         if labels is None:
@@ -506,17 +727,17 @@ class Graph:
             y = cy + radius * math.sin(angle)
             g.create_node(x, y, label=labels[i], node_id=labels[i])
 
-        # edges
-        seen: Set = set()
+        # edges.  Every cell (i, j) is visited once, so only an undirected
+        # j < i can repeat an edge: the one row j already made from (j, i)
+        INF = float("inf")
         for i in range(n):
-            for j in range(len(matrix[i])):
-                val = matrix[i][j]
-                if val == 0 or val == float("inf") or val == -1:
-                    continue
-                key = frozenset([i, j]) if not directed else (i, j)
-                if key in seen:
+            for j, val in enumerate(matrix[i]):
+                if val == 0 or val == INF or val == -1:
                     continue
-                seen.add(key)
+                if not directed and j < i and i < len(matrix[j]):
+                    mirror = matrix[j][i]
+                    if not (mirror == 0 or mirror == INF or mirror == -1):
+                        continue
                 w = val if weighted else 1.0
                 g.create_edge(labels[i], labels[j], weight=w)
 
@@ -1,7 +1,10 @@
+import math
 from enum import Enum
 from typing import Optional, Tuple, Dict, Any
 import uuid
 
+_INF = math.inf                 # default for the distance / score getters
+
 
 # ---------------------------------------------------------------------------
 # Node State Enum — maps 1-to-1 with the visual encoding palette
@@ -97,7 +100,7 @@ class Node:
     # ------------------------------------------------------------------
     @property
     def dist(self) -> float:
-        return self.meta.get("dist", float("inf"))
+        return self.meta.get("dist", _INF)
 
     @dist.setter
     def dist(self, value: float):
@@ -113,7 +116,7 @@ class Node:
 
     @property
     def g(self) -> float:         # cost from source
-        return self.meta.get("g", float("inf"))
+        return self.meta.get("g", _INF)
 
     @g.setter
     def g(self, value: float):
@@ -121,7 +124,7 @@ class Node:
 
     @property
     def h(self) -> float:         # heuristic estimate to target
-        return self.meta.get("h", float("inf"))
+        return self.meta.get("h", _INF)
 
     @h.setter
     def h(self, value: float):
@@ -129,7 +132,7 @@ class Node:
 
     @property
     def f(self) -> float:         # f = g + h
-        return self.meta.get("f", float("inf"))
+        return self.meta.get("f", _INF)
 
     @f.setter
     def f(self, value: float):
@@ -140,7 +143,7 @@ class Node:
     # ------------------------------------------------------------------
     def distance_to(self, other: "Node") -> float:
         """Euclidean distance — used as default heuristic in A*."""
-        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** 0.5
+        return math.hypot(self.x - other.x, self.y - other.y)
 
     # ------------------------------------------------------------------
     # Serialisation  (for save / export / import)
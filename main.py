@@ -33,12 +33,14 @@ from flask import Flask, render_template_string, request, jsonify, session
 import secrets
 import sys
 import os
+from dataclasses import asdict
 
 # add project root to path so imports work
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from graph import Graph
 from algorithms import get_algorithm, list_algorithms
+from algorithms.step import Step, materialize
 from engine import Stepper, Recorder, compare
 from ui import (
     render_canvas,
@@ -93,6 +95,18 @@ def set_state(**kwargs):
         session[k] = v
 
 
+def load_step(steps: list, idx: int) -> Step:
+    """
+    Rebuild step `idx` from its session dict.  Delta-encoded steps are
+    resolved against their keyframe so the renderer always gets full maps.
+    """
+    step = Step(**steps[idx])
+    if step.keyframe is None:
+        return step
+    chain = [Step(**d) for d in steps[step.keyframe:idx]] + [step]
+    return materialize(chain)
+
+
 # ---------------------------------------------------------------------------
 # Main UI Route
 # ---------------------------------------------------------------------------
@@ -260,6 +274,12 @@ def api_run():
             "frontier":        s.frontier,
             "path":            s.path,
             "distances":       s.distances,
+            "distance_deltas": s.distance_deltas,
+            "visited_deltas":  s.visited_deltas,
+            "queue_deltas":    s.queue_deltas,
+            "node_state_deltas": s.node_state_deltas,
+            "keyframe":        s.keyframe,
+            "batched_relaxations": s.batched_relaxations,
             "pseudocode_line": s.pseudocode_line,
             "explanation":     s.explanation,
             "overlay":         s.overlay,
@@ -267,12 +287,11 @@ def api_run():
         }
         for s in rec.steps
     ]
-    session["metrics"] = rec.metrics.__dict__ if rec.metrics else {}
+    session["metrics"] = asdict(rec.metrics) if rec.metrics else {}
     set_state(current_step=0, total_steps=len(rec.steps), is_playing=False)
 
     # render first step
-    from algorithms.step import Step
-    step0 = Step(**session["steps"][0])
+    step0 = load_step(session["steps"], 0)
     svg = render_canvas(graph, step0, show_overlays=True)
 
     algo_info = get_algorithm(algo_key)
@@ -309,8 +328,7 @@ def api_step_next():
     new_idx = state["current_step"] + 1
     set_state(current_step=new_idx)
 
-    from algorithms.step import Step
-    step = Step(**steps[new_idx])
+    step = load_step(steps, new_idx)
     svg = render_canvas(graph, step, show_overlays=True)
 
     algo_info = get_algorithm(state["selected_algo"])
@@ -341,8 +359,7 @@ def api_step_prev():
     new_idx = state["current_step"] - 1
     set_state(current_step=new_idx)
 
-    from algorithms.step import Step
-    step = Step(**steps[new_idx])
+    step = load_step(steps, new_idx)
     svg = render_canvas(graph, step, show_overlays=True)
 
     algo_info = get_algorithm(state["selected_algo"])
@@ -373,8 +390,7 @@ def api_step_goto():
 
     set_state(current_step=idx)
 
-    from algorithms.step import Step
-    step = Step(**steps[idx])
+    step = load_step(steps, idx)
     svg = render_canvas(graph, step, show_overlays=True)
 
     algo_info = get_algorithm(state["selected_algo"])